@@ -0,0 +1,10 @@
+from django.urls import path
+
+from books.async_views import book_detail, book_list
+
+urlpatterns = [
+    path("", book_list, name="book-list"),
+    path("<int:pk>/", book_detail, name="book-detail"),
+]
+
+app_name = "books-async"
@@ -0,0 +1,45 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from books.models import Book
+from books.search import search_books
+from books.serializers import BookSerializer
+from library_service_project.async_api import (
+    async_api_view,
+    check_throttle,
+    keyset_page,
+    serialize_object,
+)
+from library_service_project.throttling import CatalogueRateThrottle
+
+
+@require_safe
+@async_api_view
+async def book_list(request):
+    """
+    List books filtered by `q`, `title` and `author` like the sync list, but
+    in id order even when searching, and without its response cache or
+    conditional GET.
+    """
+    await check_throttle(request, CatalogueRateThrottle())
+    queryset = Book.objects.all()
+    query = request.GET.get("q")
+    title = request.GET.get("title")
+    author = request.GET.get("author")
+    if query and query.strip():
+        queryset = search_books(queryset, query)
+    if title:
+        queryset = queryset.filter(title__icontains=title)
+    if author:
+        queryset = queryset.filter(author__icontains=author)
+
+    return JsonResponse(await keyset_page(request, queryset, BookSerializer))
+
+
+@require_safe
+@async_api_view
+async def book_detail(request, pk):
+    await check_throttle(request, CatalogueRateThrottle())
+    return JsonResponse(
+        await serialize_object(request, Book.objects.all(), BookSerializer, pk=pk)
+    )
@@ -0,0 +1,117 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from library_service_project.replicas import pin_to_primary
+
+VERSION_KEY = "books:catalogue-version"
+HITS_KEY = "books:cache-hits"
+MISSES_KEY = "books:cache-misses"
+CATALOGUE_PIN = "books:catalogue"
+
+
+def get_cache():
+    return caches[settings.BOOK_CACHE_ALIAS]
+
+
+def get_catalogue_version():
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock rather than 1, so a version lost to eviction
+        # never matches entries cached under an earlier version.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _incr_catalogue_version():
+    try:
+        get_cache().incr(VERSION_KEY)
+    except ValueError:
+        get_catalogue_version()
+
+
+def _commit_catalogue_version():
+    _incr_catalogue_version()
+    # Until the replicas have the commit, responses read from them would be
+    # cached under the new version.
+    pin_to_primary(CATALOGUE_PIN)
+
+
+def bump_catalogue_version():
+    """
+    Invalidate every cached catalogue response. The version is bumped again
+    once the transaction commits, so responses cached by other requests
+    before the commit are not served afterwards.
+    """
+    _incr_catalogue_version()
+    transaction.on_commit(_commit_catalogue_version)
+
+
+def _count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Backends that keep nothing, like DummyCache.
+                pass
+
+
+def get_cache_stats():
+    cache = get_cache()
+    return {
+        "version": get_catalogue_version(),
+        "hits": cache.get(HITS_KEY, 0),
+        "misses": cache.get(MISSES_KEY, 0),
+    }
+
+
+class CatalogueCacheMixin:
+    """Cache list and retrieve responses until the catalogue version changes."""
+
+    def get_cache_key(self, request):
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        key = "|".join(
+            [
+                self.action,
+                str(self.kwargs.get(self.lookup_url_kwarg or self.lookup_field, "")),
+                request.get_host(),
+                params,
+            ]
+        )
+        digest = hashlib.md5(key.encode()).hexdigest()
+        return f"books:v{get_catalogue_version()}:{digest}"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            _count(HITS_KEY)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        _count(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.BOOK_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,167 @@
+import csv
+import json
+import time
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from books.cache import bump_catalogue_version
+from books.models import Book
+from books.serializers import BookSerializer
+
+BATCH_SIZE = 1000
+FILE_FORMATS = ("csv", "jsonl")
+UPDATE_FIELDS = ("cover", "inventory", "daily_fee")
+
+
+class ImportReport:
+    """
+    Counters of a catalogue import, keeping only the first rejected rows.
+    Skipped rows matched a book without changing it, or were superseded by a
+    later row for the same title and author.
+    """
+
+    def __init__(self, max_errors=100):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.errors = []
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def reject(self, line, errors):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+    def write(self, batch):
+        created, updated = _write_batch(batch)
+        self.created += created
+        self.updated += updated
+        self.skipped += len(batch) - created - updated
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows / self.elapsed) if self.elapsed else 0,
+        }
+
+
+def detect_format(filename):
+    extension = filename.rsplit(".", 1)[-1].lower()
+    return extension if extension in FILE_FORMATS else None
+
+
+def _read_rows(stream, file_format):
+    """Yield (line number, row, parse error) for every record of the stream."""
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield line_number, None, [str(error)]
+            continue
+        if isinstance(row, dict):
+            yield line_number, row, None
+        else:
+            yield line_number, None, ["Expected a JSON object."]
+
+
+def _write_batch(books):
+    """
+    Upsert a batch of validated books, matching on title and author.
+    Matching books are updated with one UPDATE per distinct set of new
+    values, and books whose values did not change are not written at all.
+    Return the number of rows that created and that updated books.
+    """
+    existing = {}
+    matches = Book.objects.filter(title__in={title for title, _ in books}).only(
+        "title", "author", *UPDATE_FIELDS
+    )
+    for book in matches:
+        if (book.title, book.author) in books:
+            existing.setdefault((book.title, book.author), []).append(book)
+
+    to_create = []
+    to_update = {}
+    updated = 0
+    for key, data in books.items():
+        if key not in existing:
+            to_create.append(Book(**data))
+            continue
+        values = tuple(data[field] for field in UPDATE_FIELDS)
+        changed = [
+            book.pk
+            for book in existing[key]
+            if values != tuple(getattr(book, field) for field in UPDATE_FIELDS)
+        ]
+        if changed:
+            to_update.setdefault(values, []).extend(changed)
+            updated += 1
+
+    with transaction.atomic():
+        Book.objects.bulk_create(to_create)
+        for values, pks in to_update.items():
+            Book.objects.filter(pk__in=pks).update(
+                updated_at=timezone.now(), **dict(zip(UPDATE_FIELDS, values))
+            )
+        if to_create or to_update:
+            bump_catalogue_version()
+    return len(to_create), updated
+
+
+def import_books(stream, file_format, batch_size=BATCH_SIZE):
+    """
+    Stream books from a CSV or JSONL text stream into the catalogue.
+    Rows are validated with BookSerializer and written in batches, so memory
+    use depends on the batch size and not on the size of the input.
+    """
+    report = ImportReport()
+    # One serializer validates every row, so its fields are only built once.
+    serializer = BookSerializer()
+    batch = {}
+    for line, row, errors in _read_rows(stream, file_format):
+        report.rows += 1
+        if errors is None:
+            try:
+                data = serializer.run_validation(row)
+            except ValidationError as error:
+                errors = error.detail
+            else:
+                key = (data["title"], data["author"])
+                if key in batch:
+                    # The later row wins, as it would in a later batch.
+                    report.skipped += 1
+                batch[key] = data
+        if errors is not None:
+            report.reject(line, errors)
+
+        if len(batch) >= batch_size:
+            report.write(batch)
+            batch = {}
+
+    if batch:
+        report.write(batch)
+
+    report.finish()
+    return report
@@ -0,0 +1,141 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management import BaseCommand, CommandError
+
+
+class LoadResult:
+    def __init__(self):
+        self.timings = []
+        self.statuses = {}
+        self.errors = 0
+        self.elapsed = 0.0
+
+
+async def _read_response(reader):
+    """Read one HTTP/1.1 response; return (status, keep the connection)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get("connection", "").lower() != "close"
+
+
+async def _worker(url, headers, remaining, result):
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+        + "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        + "\r\n"
+    ).encode("latin-1")
+
+    connection = None
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection(
+                    parts.hostname, port, ssl=parts.scheme == "https" or None
+                )
+            reader, writer = connection
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            result.errors += 1
+            if connection is not None:
+                connection[1].close()
+            connection = None
+            continue
+
+        result.timings.append((time.perf_counter() - started) * 1000)
+        result.statuses[status] = result.statuses.get(status, 0) + 1
+        if not keep_alive:
+            connection[1].close()
+            connection = None
+
+    if connection is not None:
+        connection[1].close()
+
+
+async def run_load(url, requests, concurrency, headers=None):
+    """Send `requests` GETs to the url over `concurrency` keep-alive clients."""
+    result = LoadResult()
+    remaining = [requests]
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(_worker(url, headers or {}, remaining, result) for _ in range(concurrency))
+    )
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+class Command(BaseCommand):
+    """Django command to measure HTTP throughput and latency under load"""
+
+    help = (
+        "Hit running servers with concurrent keep-alive GET requests and "
+        "report throughput and latency percentiles, e.g. the same endpoint "
+        "behind a WSGI and an ASGI server, or /api/books/ against "
+        "/api/async/books/ under uvicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="+")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument("--warmup", type=int, default=50)
+        parser.add_argument("--token", help="JWT access token to send")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+        headers = {}
+        if options["token"]:
+            headers["Authorization"] = f"Authorize {options['token']}"
+
+        for url in options["urls"]:
+            if options["warmup"]:
+                asyncio.run(
+                    run_load(url, options["warmup"], options["concurrency"], headers)
+                )
+            result = asyncio.run(
+                run_load(url, options["requests"], options["concurrency"], headers)
+            )
+            self.report(url, result)
+
+    def report(self, url, result):
+        if len(result.timings) < 2:
+            raise CommandError(f"{url}: too few successful requests to report.")
+        percentiles = statistics.quantiles(result.timings, n=100)
+        statuses = ", ".join(
+            f"{status}: {count}" for status, count in sorted(result.statuses.items())
+        )
+        self.stdout.write(
+            f"{url}: {len(result.timings) / result.elapsed:.0f} req/s, "
+            f"p50={percentiles[49]:.1f}ms p99={percentiles[98]:.1f}ms "
+            f"({statuses}; {result.errors} errors)"
+        )
@@ -0,0 +1,132 @@
+import random
+import statistics
+import time
+
+from django.core.management import BaseCommand
+from django.db.models import Q, Value
+from django.db.models.functions import Lower, StrIndex
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from books.models import Book
+from books.search import search_books
+
+SYLLABLES = (
+    "ka ri mo la ten vor shi dan el ur pa zet no bri sol gan tha mi ros cu"
+).split()
+
+
+def make_vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.sample(SYLLABLES, rng.randint(2, 3))))
+    return sorted(words)
+
+
+def scan_books(query):
+    """
+    The ?q= filter without an index: the trigram indexes cover UPPER(title)
+    and UPPER(author), not LOWER(). The matches are ranked by where the first
+    term occurs in the title, so, as with the search, no LIMIT can end the
+    scan early.
+    """
+    terms = query.lower().split()
+    queryset = Book.objects.annotate(
+        title_lower=Lower("title"), author_lower=Lower("author")
+    )
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title_lower__contains=term) | Q(author_lower__contains=term)
+        )
+    return queryset.annotate(
+        position=StrIndex("title_lower", Value(terms[0]))
+    ).order_by("position", "id")
+
+
+class Command(BaseCommand):
+    """Django command to measure book search latency on a large catalogue"""
+
+    help = (
+        "Seed --books synthetic books into a throwaway test database and "
+        "compare the latency of the indexed ?q= search with the same "
+        "title/author substring filter run as a full scan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=1_000_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_config = setup_databases(
+            verbosity=0, interactive=False, aliases={"default"}
+        )
+        try:
+            self.benchmark(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def benchmark(self, options):
+        rng = random.Random(options["seed"])
+        words = make_vocabulary(rng, 5000)
+        names = [word.capitalize() for word in words[:500]]
+        self.seed_books(rng, words, names, options["books"], options["batch_size"])
+
+        queries = [
+            " ".join(rng.sample(words, rng.randint(1, 2)))
+            for _ in range(options["queries"])
+        ]
+        page_size = options["page_size"]
+        indexed = self.measure(
+            lambda query: search_books(Book.objects.all(), query).order_by(
+                "-search_rank", "id"
+            )[:page_size],
+            queries,
+        )
+        scan = self.measure(lambda query: scan_books(query)[:page_size], queries)
+        self.report("search (?q=)", indexed)
+        self.report("unindexed scan", scan)
+
+    def seed_books(self, rng, words, names, missing, batch_size):
+        self.stdout.write(f"Seeding {missing} books...")
+        started = time.perf_counter()
+        while missing > 0:
+            size = min(batch_size, missing)
+            Book.objects.bulk_create(
+                Book(
+                    title=" ".join(rng.sample(words, rng.randint(2, 4))).title(),
+                    author=f"{rng.choice(names)} {rng.choice(names)}",
+                    cover=rng.choice(Book.CoverChoices.values),
+                    inventory=rng.randint(0, 20),
+                    daily_fee=rng.randint(50, 500) / 100,
+                )
+                for _ in range(size)
+            )
+            missing -= size
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Seeded in {elapsed:.1f}s")
+
+    @staticmethod
+    def measure(build_queryset, queries):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            list(build_queryset(query))
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def report(self, name, timings):
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{name}: p50={percentiles[49]:.2f}ms "
+            f"p95={percentiles[94]:.2f}ms p99={percentiles[98]:.2f}ms "
+            f"max={max(timings):.2f}ms over {len(timings)} queries"
+        )
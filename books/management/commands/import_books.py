@@ -0,0 +1,37 @@
+from django.core.management import BaseCommand, CommandError
+
+from books.importing import BATCH_SIZE, FILE_FORMATS, detect_format, import_books
+
+
+class Command(BaseCommand):
+    """Django command to import books from a CSV or JSONL file"""
+
+    help = (
+        "Stream books from a CSV or JSONL file into the catalogue, "
+        "updating books that match on title and author."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FILE_FORMATS, dest="file_format")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        file_format = options["file_format"] or detect_format(options["path"])
+        if file_format is None:
+            raise CommandError("Cannot detect the file format, pass --format.")
+
+        with open(options["path"], encoding="utf-8", newline="") as stream:
+            report = import_books(stream, file_format, options["batch_size"])
+
+        for error in report.errors:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        summary = report.as_dict()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {summary['rows']} rows in {summary['seconds']}s "
+                f"({summary['rows_per_second']} rows/s): "
+                f"{summary['created']} created, {summary['updated']} updated, "
+                f"{summary['skipped']} skipped, {summary['rejected']} rejected"
+            )
+        )
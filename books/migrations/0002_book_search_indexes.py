@@ -0,0 +1,73 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+from books.search import SQLITE_TRIGGERS
+
+POSTGRESQL_FORWARD = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS books_book_title_trgm "
+    "ON books_book USING gin (UPPER(title) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS books_book_author_trgm "
+    "ON books_book USING gin (UPPER(author) gin_trgm_ops)",
+)
+POSTGRESQL_BACKWARD = (
+    "DROP INDEX IF EXISTS books_book_title_trgm",
+    "DROP INDEX IF EXISTS books_book_author_trgm",
+)
+
+SQLITE_FORWARD = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS books_book_fts USING fts5("
+    "title, author, content='books_book', content_rowid='id', tokenize='trigram')",
+    *SQLITE_TRIGGERS.values(),
+    "INSERT INTO books_book_fts(books_book_fts) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = (
+    *(f"DROP TRIGGER IF EXISTS {name}" for name in SQLITE_TRIGGERS),
+    "DROP TABLE IF EXISTS books_book_fts",
+)
+
+
+def run_for_vendor(postgresql, sqlite):
+    def run(apps, schema_editor):
+        statements = {"postgresql": postgresql, "sqlite": sqlite}
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookSearchIndex",
+            fields=[
+                (
+                    "book",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="books.book",
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("author", models.CharField(max_length=255)),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "books_book_fts",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(
+            run_for_vendor(POSTGRESQL_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(POSTGRESQL_BACKWARD, SQLITE_BACKWARD),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 17:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0002_book_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["title", "author"], name="book_title_author_idx"
+            ),
+        ),
+    ]
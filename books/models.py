@@ -11,6 +11,38 @@ class Book(models.Model):
     cover = models.CharField(max_length=4, choices=CoverChoices.choices)
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=5, decimal_places=2)
+    # Maintained by BorrowingManager, repaired by `recount_book_borrowings`.
+    active_borrowings = models.PositiveIntegerField(default=0)
+    total_borrowings = models.PositiveIntegerField(default=0)
+    last_borrow_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["title", "author"], name="book_title_author_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class BookSearchIndex(models.Model):
+    """
+    SQLite FTS5 table behind book search, kept in sync by triggers.
+    PostgreSQL searches the books table through trigram indexes instead.
+    """
+
+    book = models.OneToOneField(
+        Book,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_index",
+    )
+    title = models.CharField(max_length=255)
+    author = models.CharField(max_length=255)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "books_book_fts"
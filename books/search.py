@@ -0,0 +1,119 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+
+# The trigram tokenizer of SQLite FTS5 can't match terms shorter than this.
+MIN_FTS_TERM_LENGTH = 3
+
+# Also run by migration 0002, which creates the FTS5 table.
+SQLITE_TRIGGERS = {
+    "books_book_fts_insert": (
+        "CREATE TRIGGER IF NOT EXISTS books_book_fts_insert "
+        "AFTER INSERT ON books_book "
+        "BEGIN "
+        "INSERT INTO books_book_fts(rowid, title, author) "
+        "VALUES (new.id, new.title, new.author); "
+        "END"
+    ),
+    "books_book_fts_delete": (
+        "CREATE TRIGGER IF NOT EXISTS books_book_fts_delete "
+        "AFTER DELETE ON books_book "
+        "BEGIN "
+        "INSERT INTO books_book_fts(books_book_fts, rowid, title, author) "
+        "VALUES ('delete', old.id, old.title, old.author); "
+        "END"
+    ),
+    "books_book_fts_update": (
+        "CREATE TRIGGER IF NOT EXISTS books_book_fts_update "
+        "AFTER UPDATE OF title, author ON books_book "
+        "BEGIN "
+        "INSERT INTO books_book_fts(books_book_fts, rowid, title, author) "
+        "VALUES ('delete', old.id, old.title, old.author); "
+        "INSERT INTO books_book_fts(rowid, title, author) "
+        "VALUES (new.id, new.title, new.author); "
+        "END"
+    ),
+}
+
+
+def ensure_sqlite_search_triggers(connection):
+    """
+    Recreate the FTS5 sync triggers if a migration rebuilt the books table
+    (SQLite drops triggers with the table) and reindex the missed rows.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s",
+            ["books_book_fts"],
+        )
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {name for name, in cursor.fetchall()}
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(
+                "INSERT INTO books_book_fts(books_book_fts) VALUES ('rebuild')"
+            )
+
+
+def contains_every_term(terms):
+    """Match books whose title or author contain every term, unindexed."""
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(author__icontains=term)
+    return condition
+
+
+def _search_postgresql(queryset, query, terms):
+    """
+    Match every term against title or author with ILIKE, which is served by
+    the GIN trigram indexes on UPPER(title) and UPPER(author), and rank the
+    matches by trigram word similarity.
+    """
+    return queryset.filter(contains_every_term(terms)).annotate(
+        search_rank=Greatest(
+            TrigramWordSimilarity(query, "title"),
+            TrigramWordSimilarity(query, "author"),
+        )
+    )
+
+
+def _search_sqlite(queryset, query, terms):
+    """Match and rank the terms with the FTS5 trigram index (bm25)."""
+    fts_terms = [term for term in terms if len(term) >= MIN_FTS_TERM_LENGTH]
+    short_terms = [term for term in terms if len(term) < MIN_FTS_TERM_LENGTH]
+    queryset = queryset.filter(contains_every_term(short_terms))
+    if not fts_terms:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    match = " AND ".join('"%s"' % term.replace('"', '""') for term in fts_terms)
+    return (
+        queryset.filter(search_index__isnull=False)
+        .filter(
+            RawSQL("books_book_fts MATCH %s", (match,), output_field=BooleanField())
+        )
+        .annotate(search_rank=-F("search_index__rank"))
+    )
+
+
+def search_books(queryset, query):
+    """
+    Filter books whose title or author contain every term of the query and
+    annotate them with a `search_rank` (higher is more relevant).
+    """
+    terms = query.split()
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        return _search_postgresql(queryset, query, terms)
+    if vendor == "sqlite":
+        return _search_sqlite(queryset, query, terms)
+    return queryset.filter(contains_every_term(terms)).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
 from books.models import Book
+from library_service_project.fields import SparseFieldsMixin
 
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = (
@@ -13,4 +14,17 @@ class BookSerializer(serializers.ModelSerializer):
             "cover",
             "inventory",
             "daily_fee",
+            "active_borrowings",
+            "total_borrowings",
+            "last_borrow_date",
         )
+        read_only_fields = (
+            "active_borrowings",
+            "total_borrowings",
+            "last_borrow_date",
+        )
+
+
+class BookImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=("csv", "jsonl"), required=False)
@@ -0,0 +1,17 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from books.cache import bump_catalogue_version
+from books.models import Book
+from books.search import ensure_sqlite_search_triggers
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_catalogue_cache(sender, **kwargs):
+    bump_catalogue_version()
+
+
+def repair_search_triggers(sender, using, **kwargs):
+    ensure_sqlite_search_triggers(connections[using])
@@ -0,0 +1,71 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from books.models import Book
+from books.serializers import BookSerializer
+
+ASYNC_BOOKS_URL = reverse("books-async:book-list")
+
+
+class AsyncBookViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.books = Book.objects.bulk_create(
+            Book(
+                title=f"Book {number}",
+                author="Author One" if number % 2 else "Author Two",
+                cover="Hard",
+                inventory=number,
+                daily_fee=1.50,
+            )
+            for number in range(5)
+        )
+
+    async def test_list_books_in_pages(self):
+        response = await self.async_client.get(ASYNC_BOOKS_URL, {"page_size": 3})
+
+        self.assertEqual(response.status_code, 200)
+        page = response.json()
+        self.assertEqual(
+            page["results"], BookSerializer(self.books[:3], many=True).data
+        )
+        response = await self.async_client.get(page["next"])
+        page = response.json()
+        self.assertEqual(
+            [book["id"] for book in page["results"]],
+            [book.id for book in self.books[3:]],
+        )
+        self.assertIsNone(page["next"])
+
+    async def test_filter_books(self):
+        response = await self.async_client.get(
+            ASYNC_BOOKS_URL, {"author": "one", "title": "3"}
+        )
+        self.assertEqual(
+            [book["id"] for book in response.json()["results"]], [self.books[3].id]
+        )
+
+    async def test_search_books(self):
+        response = await self.async_client.get(ASYNC_BOOKS_URL, {"q": "two"})
+        self.assertEqual(
+            [book["id"] for book in response.json()["results"]],
+            [book.id for book in self.books[::2]],
+        )
+
+    async def test_retrieve_book(self):
+        book = self.books[0]
+        response = await self.async_client.get(
+            reverse("books-async:book-detail", args=[book.id])
+        )
+        self.assertEqual(response.json(), BookSerializer(book).data)
+
+        response = await self.async_client.get(
+            reverse("books-async:book-detail", args=[999])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_reject_writes_and_bad_cursor(self):
+        response = await self.async_client.post(ASYNC_BOOKS_URL)
+        self.assertEqual(response.status_code, 405)
+        response = await self.async_client.get(ASYNC_BOOKS_URL, {"after": "x"})
+        self.assertEqual(response.status_code, 400)
@@ -1,9 +1,20 @@
+import io
+import json
+from datetime import date, timedelta
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
+from books.cache import get_cache
+from books.importing import import_books
 from books.models import Book
+from books.pagination import BookCursorPagination
 from books.serializers import BookSerializer
+from borrowing.models import Borrowing
 
 
 class BookTests(APITestCase):
@@ -35,7 +46,7 @@ class BookTests(APITestCase):
         books = Book.objects.all()
         serializer = BookSerializer(books, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data["results"], serializer.data)
 
     def test_create_book(self):
         url = reverse("books:book-list")
@@ -93,7 +104,7 @@ class BookTests(APITestCase):
         books = Book.objects.filter(title__icontains="Book One")
         serializer = BookSerializer(books, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data["results"], serializer.data)
 
     def test_filter_books_by_author(self):
         url = reverse("books:book-list")
@@ -101,4 +112,292 @@ class BookTests(APITestCase):
         books = Book.objects.filter(author__icontains="Author Two")
         serializer = BookSerializer(books, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data["results"], serializer.data)
+
+    def test_list_books_with_sparse_fields(self):
+        url = reverse("books:book-list")
+        response = self.client.get(url, {"fields": "id,title"}, format="json")
+        self.assertEqual(
+            response.data["results"],
+            [
+                {"id": self.book1.id, "title": self.book1.title},
+                {"id": self.book2.id, "title": self.book2.title},
+            ],
+        )
+
+    def test_list_books_is_cursor_paginated(self):
+        url = reverse("books:book-list")
+        response = self.client.get(url, {"page_size": 1}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [BookSerializer(self.book1).data])
+        self.assertIsNone(response.data["previous"])
+
+        response = self.client.get(response.data["next"], format="json")
+        self.assertEqual(response.data["results"], [BookSerializer(self.book2).data])
+        self.assertIsNone(response.data["next"])
+
+    def test_page_size_is_capped(self):
+        for number in range(3):
+            Book.objects.create(
+                title=f"Extra book {number}",
+                author="Author",
+                cover="Soft",
+                inventory=1,
+                daily_fee=1.00,
+            )
+        url = reverse("books:book-list")
+        with patch.object(BookCursorPagination, "max_page_size", 2):
+            response = self.client.get(url, {"page_size": 1000}, format="json")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_pagination_is_stable_when_books_are_added_mid_scan(self):
+        url = reverse("books:book-list")
+        first_page = self.client.get(url, {"page_size": 1}, format="json").data
+        Book.objects.create(
+            title="Inserted book",
+            author="Author",
+            cover="Soft",
+            inventory=1,
+            daily_fee=1.00,
+        )
+        second_page = self.client.get(first_page["next"], format="json").data
+
+        seen = [book["id"] for book in first_page["results"]]
+        seen += [book["id"] for book in second_page["results"]]
+        self.assertEqual(seen, [self.book1.id, self.book2.id])
+
+    def test_search_books_across_title_and_author(self):
+        Book.objects.create(
+            title="The Hobbit",
+            author="J. R. R. Tolkien",
+            cover="Hard",
+            inventory=1,
+            daily_fee=1.00,
+        )
+        url = reverse("books:book-list")
+        response = self.client.get(url, {"q": "hobbit tolkien"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["title"] for book in response.data["results"]], ["The Hobbit"]
+        )
+
+    def test_search_books_ranks_best_match_first(self):
+        Book.objects.create(
+            title="Dune Messiah",
+            author="Frank Herbert",
+            cover="Soft",
+            inventory=1,
+            daily_fee=1.00,
+        )
+        Book.objects.create(
+            title="Dune",
+            author="Frank Herbert",
+            cover="Soft",
+            inventory=1,
+            daily_fee=1.00,
+        )
+        url = reverse("books:book-list")
+        response = self.client.get(url, {"q": "dune"}, format="json")
+        titles = [book["title"] for book in response.data["results"]]
+        self.assertEqual(titles, ["Dune", "Dune Messiah"])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        url = reverse("books:book-list")
+        self.book1.title = "Renamed volume"
+        self.book1.save()
+        self.book2.delete()
+
+        response = self.client.get(url, {"q": "book"}, format="json")
+        self.assertEqual(response.data["results"], [])
+        response = self.client.get(url, {"q": "renamed"}, format="json")
+        self.assertEqual(response.data["results"], [BookSerializer(self.book1).data])
+
+    def test_search_with_short_terms(self):
+        url = reverse("books:book-list")
+        response = self.client.get(url, {"q": "one ne"}, format="json")
+        self.assertEqual(response.data["results"], [BookSerializer(self.book1).data])
+
+    def test_import_books_csv(self):
+        url = reverse("books:book-import")
+        upload = SimpleUploadedFile(
+            "books.csv",
+            b"title,author,cover,inventory,daily_fee\n"
+            b"Book one,Author One,Soft,9,2.50\n"
+            b"Imported book,Imported Author,Hard,4,1.25\n"
+            b"Broken book,Broken Author,Paper,-1,1.00\n",
+        )
+        response = self.client.post(url, {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rows"], 3)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(response.data["rejected"], 1)
+        self.assertEqual(response.data["errors"][0]["line"], 4)
+        self.book1.refresh_from_db()
+        self.assertEqual(self.book1.cover, "Soft")
+        self.assertEqual(self.book1.inventory, 9)
+        self.assertTrue(Book.objects.filter(title="Imported book").exists())
+
+    def test_import_books_jsonl_in_batches(self):
+        lines = [
+            json.dumps(
+                {
+                    "title": f"Batch book {number}",
+                    "author": "Batch Author",
+                    "cover": "Hard",
+                    "inventory": number,
+                    "daily_fee": "1.00",
+                }
+            )
+            for number in range(5)
+        ]
+        lines.append("not json")
+        stream = io.StringIO("\n".join(lines))
+
+        report = import_books(stream, "jsonl", batch_size=2)
+
+        self.assertEqual(report.created, 5)
+        self.assertEqual(report.rejected, 1)
+        self.assertEqual(Book.objects.filter(author="Batch Author").count(), 5)
+
+    def test_import_books_skips_unchanged_and_duplicate_rows(self):
+        stream = io.StringIO(
+            "title,author,cover,inventory,daily_fee\n"
+            "Book one,Author One,Hard,5,1.50\n"
+            "Book two,Author Two,Soft,7,2.00\n"
+            "Book two,Author Two,Soft,8,2.00\n"
+        )
+
+        report = import_books(stream, "csv")
+
+        self.assertEqual(report.rows, 3)
+        self.assertEqual(report.created, 0)
+        self.assertEqual(report.updated, 1)
+        self.assertEqual(report.skipped, 2)
+        self.book2.refresh_from_db()
+        self.assertEqual(self.book2.inventory, 8)
+
+    def test_import_books_requires_admin(self):
+        regular_user = get_user_model().objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        self.client.force_authenticate(user=regular_user)
+        url = reverse("books:book-import")
+        upload = SimpleUploadedFile("books.csv", b"title,author\n")
+        response = self.client.post(url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BookCacheTests(APITestCase):
+
+    def setUp(self):
+        get_cache().clear()
+        self.book = Book.objects.create(
+            title="Cached book",
+            author="Author",
+            cover="Hard",
+            inventory=2,
+            daily_fee=1.50,
+        )
+        self.admin_user = get_user_model().objects.create_superuser(
+            email="admin@admin.com", password="admin1234pass"
+        )
+
+    def test_list_is_served_from_cache(self):
+        url = reverse("books:book-list")
+        first = self.client.get(url, {"title": "cached"})
+        with self.assertNumQueries(0):
+            second = self.client.get(url, {"title": "cached"})
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(self.client.get(url, {"title": "other"})["X-Cache"], "MISS")
+
+    def test_book_changes_invalidate_cache(self):
+        url = reverse("books:book-detail", kwargs={"pk": self.book.pk})
+        self.client.get(url)
+        self.book.title = "Renamed book"
+        self.book.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["title"], "Renamed book")
+
+    def test_borrowing_invalidates_cache(self):
+        url = reverse("books:book-detail", kwargs={"pk": self.book.pk})
+        self.client.get(url)
+        Borrowing.objects.borrow(
+            user=self.admin_user,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["inventory"], 1)
+
+    def test_cache_stats(self):
+        url = reverse("books:book-list")
+        self.client.get(url)
+        self.client.get(url)
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get(reverse("books:book-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["hits"], 1)
+        self.assertEqual(response.data["misses"], 1)
+
+    def test_conditional_get_returns_not_modified(self):
+        url = reverse("books:book-detail", kwargs={"pk": self.book.pk})
+        response = self.client.get(url)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.book.inventory = 5
+        self.book.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_conditional_get_on_list_ignores_if_modified_since(self):
+        url = reverse("books:book-list")
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+
+        # Deleting an older book leaves the latest updated_at unchanged.
+        older_book = Book.objects.create(
+            title="Older book", author="Author", cover="Soft", inventory=1, daily_fee=1
+        )
+        self.book.save()
+        last_modified = self.client.get(
+            reverse("books:book-detail", kwargs={"pk": self.book.pk})
+        )["Last-Modified"]
+        older_book.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_conditional_get_per_response_format(self):
+        url = reverse("books:book-list")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(
+            url, HTTP_ACCEPT="application/msgpack", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_dummy_cache_serves_uncached_responses(self):
+        url = reverse("books:book-list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], "MISS")
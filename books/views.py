@@ -1,14 +1,49 @@
+import io
+
+from django.conf import settings
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter
-from rest_framework import viewsets
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 
+from books.cache import (
+    CATALOGUE_PIN,
+    CatalogueCacheMixin,
+    get_cache,
+    get_cache_stats,
+)
+from books.importing import detect_format, import_books
 from books.models import Book
-from books.serializers import BookSerializer
+from books.pagination import BookCursorPagination
+from books.search import search_books
+from books.serializers import BookSerializer, BookImportSerializer
+from library_service_project.conditional import ConditionalGetMixin
+from library_service_project.fields import SparseFieldsViewMixin
+from library_service_project.replicas import ReplicaReadMixin
+from library_service_project.throttling import CatalogueRateThrottle
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    description="Only return these fields (ex. ?fields=id,title,inventory)",
+    required=False,
+    type={"type": "string"},
+)
 
 
 @extend_schema_view(
     list=extend_schema(
         parameters=[
+            OpenApiParameter(
+                name="q",
+                description=(
+                    "Search title and author, most relevant first "
+                    "(ex. ?q=tolkien hobbit)"
+                ),
+                required=False,
+                type={"type": "string"},
+            ),
             OpenApiParameter(
                 name="title",
                 description="Filter by book title (ex. ?title=book)",
@@ -21,10 +56,15 @@ from books.serializers import BookSerializer
                 required=False,
                 type={"type": "string"},
             ),
+            FIELDS_PARAMETER,
         ],
-        description="Retrieve a list of all books with filtering by title and/or author",
+        description=(
+            "Retrieve a list of all books with search "
+            "and filtering by title and/or author"
+        ),
     ),
     retrieve=extend_schema(
+        parameters=[FIELDS_PARAMETER],
         description="Retrieve a specific book by id",
     ),
     create=extend_schema(
@@ -40,9 +80,17 @@ from books.serializers import BookSerializer
         description="Delete a book",
     ),
 )
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CatalogueCacheMixin,
+    SparseFieldsViewMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
+    pagination_class = BookCursorPagination
+    values_serialization = True
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
@@ -51,14 +99,79 @@ class BookViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    def get_pins(self, request):
+        # Responses are cached for everyone, so any catalogue change keeps
+        # every reader on the primary for a while.
+        return [*super().get_pins(request), CATALOGUE_PIN]
+
+    def get_throttles(self):
+        if self.action in ["list", "retrieve"]:
+            return [CatalogueRateThrottle()]
+        return []
+
+    def get_serializer_class(self):
+        if self.action == "import_catalogue":
+            return BookImportSerializer
+        return BookSerializer
+
+    def get_validator_state(self, request):
+        # Every change to book rows bumps the catalogue version, so the rows
+        # behind the validators can be cached alongside the responses. The
+        # ETag itself is built per request, for the negotiated format.
+        return get_cache().get_or_set(
+            f"{self.get_cache_key(request)}:validators",
+            lambda: super(BookViewSet, self).get_validator_state(request),
+            settings.BOOK_CACHE_TIMEOUT,
+        )
+
     def get_queryset(self):
         queryset = Book.objects.all()
+        query = self.request.query_params.get("q")
         title = self.request.query_params.get("title")
         author = self.request.query_params.get("author")
 
+        if query and query.strip():
+            queryset = search_books(queryset, query)
         if title:
             queryset = queryset.filter(title__icontains=title)
         if author:
             queryset = queryset.filter(author__icontains=author)
 
         return queryset
+
+    @extend_schema(
+        description=(
+            "Import books from a CSV or JSONL file, "
+            "updating books that match on title and author"
+        ),
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        url_name="import",
+        parser_classes=(MultiPartParser,),
+    )
+    def import_catalogue(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        file_format = serializer.validated_data.get("file_format") or detect_format(
+            upload.name
+        )
+        if file_format is None:
+            return Response(
+                {"file_format": ["Cannot detect the file format."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        report = import_books(stream, file_format)
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+    @extend_schema(
+        description="Catalogue cache version and hit/miss counters",
+    )
+    @action(detail=False, methods=["get"], url_path="cache-stats")
+    def cache_stats(self, request):
+        return Response(get_cache_stats(), status=status.HTTP_200_OK)
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
-from borrowing.models import Borrowing
+from borrowing.models import ArchivedBorrowing, Borrowing, Fine
 
 admin.site.register(Borrowing)
+admin.site.register(Fine)
+admin.site.register(ArchivedBorrowing)
@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+
+from django.db import connections, transaction
+from django.db.models import DateTimeField, Q, Value
+from django.utils import timezone
+
+from borrowing.models import ArchivedBorrowing, Borrowing, Fine
+
+CHUNK_SIZE = 2000
+ARCHIVE_FIELDS = {
+    "id": "pk",
+    "user": "user_id",
+    "book": "book_id",
+    "borrow_date": "borrow_date",
+    "expected_return_date": "expected_return_date",
+    "actual_return_date": "actual_return_date",
+    "fine_amount": "fine__amount",
+    "updated_at": "updated_at",
+}
+
+
+def archivable_borrowings(before):
+    """
+    Borrowings returned before `before` with no fine or a paid one. Pending
+    fines keep their borrowing in the live table until they are settled.
+    """
+    return Borrowing.objects.filter(actual_return_date__lt=before).filter(
+        Q(fine__isnull=True) | Q(fine__status=Fine.StatusChoices.PAID)
+    )
+
+
+def _copy_to_archive(borrowings):
+    """Copy the borrowings into the archive in one INSERT ... SELECT."""
+    rows = (
+        borrowings.order_by()
+        .annotate(archive_time=Value(timezone.now(), output_field=DateTimeField()))
+        .values_list(*ARCHIVE_FIELDS.values(), "archive_time")
+    )
+    select, params = rows.query.sql_with_params()
+
+    connection = connections[borrowings.db]
+    quote = connection.ops.quote_name
+    columns = ", ".join(
+        quote(ArchivedBorrowing._meta.get_field(name).column)
+        for name in (*ARCHIVE_FIELDS, "archived_at")
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(ArchivedBorrowing._meta.db_table)} "
+            f"({columns}) {select}",
+            params,
+        )
+
+
+def archive_borrowings(days, today=None, chunk_size=CHUNK_SIZE, after_id=0):
+    """
+    Move borrowings returned more than `days` days ago to ArchivedBorrowing,
+    walking them in primary key order. Each chunk is copied and deleted,
+    fines included, in one transaction, so the book counters and daily
+    rollups, which count archived borrowings too, don't change. Yield
+    (last borrowing id, borrowings archived) after every chunk.
+    """
+    today = today or date.today()
+    queryset = archivable_borrowings(today - timedelta(days=days))
+
+    while True:
+        with transaction.atomic(using=queryset.db):
+            # Lock the chunk so a borrowing can't gain an unpaid fine or be
+            # changed between the copy and the delete.
+            ids = list(
+                queryset.filter(pk__gt=after_id)
+                .select_for_update(of=("self",))
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not ids:
+                return
+            _copy_to_archive(queryset.filter(pk__in=ids))
+            Borrowing.objects.filter(pk__in=ids).delete()
+
+        after_id = ids[-1]
+        yield after_id, len(ids)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from borrowing.async_views import borrowing_detail, borrowing_list
+
+urlpatterns = [
+    path("", borrowing_list, name="borrowing-list"),
+    path("<int:pk>/", borrowing_detail, name="borrowing-detail"),
+]
+
+app_name = "borrowing-async"
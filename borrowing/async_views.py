@@ -0,0 +1,37 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+
+from borrowing.filters import filter_borrowing_list
+from borrowing.models import Borrowing
+from borrowing.serializers import BorrowingSerializer
+from library_service_project.async_api import (
+    async_api_view,
+    authenticate,
+    keyset_page,
+    serialize_object,
+)
+
+
+@require_safe
+@async_api_view
+async def borrowing_list(request):
+    """List borrowings newest first, with the filters of the sync list."""
+    user = await authenticate(request)
+    queryset = filter_borrowing_list(
+        Borrowing.objects.select_related("book", "user"), user, request.GET
+    )
+    return JsonResponse(
+        await keyset_page(request, queryset, BorrowingSerializer, descending=True)
+    )
+
+
+@require_safe
+@async_api_view
+async def borrowing_detail(request, pk):
+    user = await authenticate(request)
+    queryset = Borrowing.objects.select_related("book", "user")
+    if not user.is_staff:
+        queryset = queryset.filter(user=user)
+    return JsonResponse(
+        await serialize_object(request, queryset, BorrowingSerializer, pk=pk)
+    )
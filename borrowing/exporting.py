@@ -0,0 +1,74 @@
+import csv
+import heapq
+import json
+
+CHUNK_SIZE = 2000
+FILE_FORMATS = ("csv", "jsonl")
+CONTENT_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+EXPORT_FIELDS = {
+    "id": "id",
+    "user_id": "user_id",
+    "user_email": "user__email",
+    "book_id": "book_id",
+    "book_title": "book__title",
+    "book_author": "book__author",
+    "borrow_date": "borrow_date",
+    "expected_return_date": "expected_return_date",
+    "actual_return_date": "actual_return_date",
+}
+
+
+class _Echo:
+    """File-like object that hands back what the csv writer writes."""
+
+    def write(self, value):
+        return value
+
+
+def filter_borrowings(
+    queryset, user_id=None, borrowed_after=None, borrowed_before=None
+):
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+    if borrowed_after:
+        queryset = queryset.filter(borrow_date__gte=borrowed_after)
+    if borrowed_before:
+        queryset = queryset.filter(borrow_date__lte=borrowed_before)
+    return queryset
+
+
+def export_borrowings(queryset, file_format, chunk_size=CHUNK_SIZE, archived=None):
+    """
+    Yield the borrowings of the queryset, merged by id with the `archived`
+    queryset of ArchivedBorrowing, as CSV or JSONL text, one block per
+    chunk. Rows are flat tuples read through server-side cursors, so memory
+    stays constant however many borrowings are exported.
+    """
+    rows = heapq.merge(
+        *(
+            source.order_by("id")
+            .values_list(*EXPORT_FIELDS.values())
+            .iterator(chunk_size=chunk_size)
+            for source in (queryset, archived)
+            if source is not None
+        )
+    )
+    columns = tuple(EXPORT_FIELDS)
+
+    if file_format == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        encode = writer.writerow
+    else:
+
+        def encode(row):
+            return json.dumps(dict(zip(columns, row)), default=str) + "\n"
+
+    block = []
+    for row in rows:
+        block.append(encode(row))
+        if len(block) == chunk_size:
+            yield "".join(block)
+            block = []
+    if block:
+        yield "".join(block)
@@ -0,0 +1,81 @@
+from argparse import ArgumentTypeError
+from datetime import date
+
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+from borrowing.exporting import filter_borrowings
+
+
+def parse_date_value(value):
+    """Parse a YYYY-MM-DD date, returning None if it isn't a valid one."""
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+def get_date_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    parsed = parse_date_value(value)
+    if parsed is None:
+        raise ValidationError({name: "Enter a date in YYYY-MM-DD format."})
+    return parsed
+
+
+def date_argument(value):
+    """argparse type for the YYYY-MM-DD options of management commands."""
+    parsed = parse_date_value(value)
+    if parsed is None:
+        raise ArgumentTypeError(f"Enter a date in YYYY-MM-DD format, not {value!r}.")
+    return parsed
+
+
+def get_int_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Enter a whole number."})
+
+
+def filter_borrowing_list(queryset, user, params):
+    """
+    Apply the borrowing list query parameters. Non-staff users only see their
+    own borrowings; staff may filter by `user_id`.
+    """
+    if user.is_staff:
+        user_id = get_int_param(params, "user_id")
+        if user_id is not None:
+            queryset = queryset.filter(user_id=user_id)
+    else:
+        queryset = queryset.filter(user=user)
+
+    is_active = params.get("is_active")
+    if is_active:
+        if is_active.lower() == "true":
+            queryset = queryset.filter(actual_return_date__isnull=True)
+        elif is_active.lower() == "false":
+            queryset = queryset.filter(actual_return_date__isnull=False)
+
+    book_id = get_int_param(params, "book_id")
+    if book_id is not None:
+        queryset = queryset.filter(book_id=book_id)
+
+    queryset = filter_borrowings(
+        queryset,
+        borrowed_after=get_date_param(params, "borrowed_after"),
+        borrowed_before=get_date_param(params, "borrowed_before"),
+    )
+
+    is_overdue = params.get("is_overdue")
+    if is_overdue and is_overdue.lower() == "true":
+        queryset = queryset.filter(
+            actual_return_date__isnull=True, expected_return_date__lt=date.today()
+        )
+
+    return queryset
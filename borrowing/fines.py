@@ -0,0 +1,102 @@
+from datetime import date
+
+from django.db import connections, transaction
+from django.db.models import DateField, DateTimeField, DecimalField, F, Q, Value
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from borrowing.functions import DaysBetween
+from borrowing.models import Borrowing, Fine
+
+CHUNK_SIZE = 5000
+
+
+def overdue_borrowings(today):
+    """Active borrowings past their return date whose fine is not paid."""
+    return Borrowing.objects.filter(
+        actual_return_date__isnull=True, expected_return_date__lt=today
+    ).filter(Q(fine__isnull=True) | ~Q(fine__status=Fine.StatusChoices.PAID))
+
+
+def _upsert_fines(borrowings, today):
+    """Create or refresh the fines of the borrowings in one INSERT ... SELECT."""
+    now = Value(timezone.now(), output_field=DateTimeField())
+    days_overdue = DaysBetween(
+        F("expected_return_date"), Value(today, output_field=DateField())
+    )
+    rows = (
+        borrowings.order_by()
+        .annotate(
+            fine_days=days_overdue,
+            fine_amount=Round(
+                F("book__daily_fee") * days_overdue,
+                2,
+                output_field=DecimalField(max_digits=8, decimal_places=2),
+            ),
+            fine_status=Value(Fine.StatusChoices.PENDING),
+            fine_created_at=now,
+            fine_updated_at=now,
+        )
+        .values_list(
+            "pk",
+            "fine_days",
+            "fine_amount",
+            "fine_status",
+            "fine_created_at",
+            "fine_updated_at",
+        )
+    )
+    select, params = rows.query.sql_with_params()
+
+    connection = connections[borrowings.db]
+    quote = connection.ops.quote_name
+    table = quote(Fine._meta.db_table)
+    columns = ", ".join(
+        quote(Fine._meta.get_field(name).column)
+        for name in (
+            "borrowing",
+            "days_overdue",
+            "amount",
+            "status",
+            "created_at",
+            "updated_at",
+        )
+    )
+    updates = ", ".join(
+        f"{quote(name)} = excluded.{quote(name)}"
+        for name in ("days_overdue", "amount", "updated_at")
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) {select} "
+            f"ON CONFLICT ({quote(Fine._meta.get_field('borrowing').column)}) "
+            f"DO UPDATE SET {updates}",
+            params,
+        )
+
+
+def accrue_fines(today=None, chunk_size=CHUNK_SIZE, after_id=0):
+    """
+    Charge `daily_fee` per overdue day on every overdue borrowing, walking
+    them in primary key order. Each chunk reads its ids and computes and
+    upserts the fines inside the database, so rerunning the scan only
+    refreshes the amounts. Yield (last borrowing id, fines written) after
+    every chunk, which lets an interrupted scan resume with `after_id`.
+    """
+    today = today or date.today()
+    queryset = overdue_borrowings(today)
+
+    while True:
+        ids = list(
+            queryset.filter(pk__gt=after_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return
+
+        with transaction.atomic(using=queryset.db):
+            _upsert_fines(queryset.filter(pk__gte=ids[0], pk__lte=ids[-1]), today)
+
+        after_id = ids[-1]
+        yield after_id, len(ids)
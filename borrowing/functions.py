@@ -0,0 +1,25 @@
+from django.db.models import Func, IntegerField
+
+
+class DaysBetween(Func):
+    """Whole days from the first date to the second one."""
+
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = IntegerField()
+
+    def __init__(self, start, end, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite stores dates as text, so subtract their Julian day numbers.
+        clone = self.copy()
+        clone.set_source_expressions(
+            [
+                Func(expression, function="JULIANDAY")
+                for expression in self.source_expressions
+            ]
+        )
+        return super(DaysBetween, clone).as_sql(
+            compiler, connection, template="CAST(%(expressions)s AS INTEGER)"
+        )
@@ -0,0 +1,207 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+from functools import partial
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from books.models import Book
+from borrowing.models import Borrowing
+
+BATCH_SIZE = 5000
+LOAN_DAYS = 14
+# Every generated user logs in with this password.
+PASSWORD = "library1234pass"
+
+TITLE_WORDS = (
+    "Silent", "River", "Winter", "Garden", "Shadow", "Empire", "Stone", "Letters",
+    "Night", "Island", "Machine", "Summer", "House", "Glass", "Kingdom", "Road",
+    "Memory", "Fire", "Ocean", "Secret", "Forest", "City", "Star", "Iron",
+)  # fmt: skip
+SURNAMES = (
+    "Smith", "Kowalski", "Garcia", "Nguyen", "Müller", "Rossi", "Tanaka", "Dubois",
+    "Novak", "Silva", "Kim", "Ivanenko", "Larsen", "Okafor", "Costa", "Haddad",
+)  # fmt: skip
+USER_FIELDS = (
+    "email",
+    "password",
+    "first_name",
+    "last_name",
+    "is_staff",
+    "is_superuser",
+    "is_active",
+    "date_joined",
+)
+BOOK_FIELDS = (
+    "title",
+    "author",
+    "cover",
+    "inventory",
+    "daily_fee",
+    "active_borrowings",
+    "total_borrowings",
+    "updated_at",
+)
+BORROWING_FIELDS = (
+    "user_id",
+    "book_id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "updated_at",
+)
+
+
+def insert_rows(model, fields, rows, batch_size=BATCH_SIZE):
+    """
+    Insert tuples of `fields` values in one transaction, streamed through
+    COPY on PostgreSQL and in executemany batches elsewhere. Return the
+    number of rows.
+    """
+    fields = [model._meta.get_field(name) for name in fields]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = ", ".join(quote(field.column) for field in fields)
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            with cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+                    count += 1
+            return count
+
+        # Not bulk_create(): it would replace borrow_date with today
+        # (auto_now_add) and builds a model instance per row.
+        sql = (
+            f"INSERT INTO {table} ({columns}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))})"
+        )
+        prepare = [
+            partial(field.get_db_prep_save, connection=connection) for field in fields
+        ]
+        rows = iter(rows)
+        while batch := list(islice(rows, batch_size)):
+            cursor.executemany(
+                sql,
+                [[to_db(value) for to_db, value in zip(prepare, row)] for row in batch],
+            )
+            count += len(batch)
+    return count
+
+
+def _skewed(rng, items, skew):
+    """Pick from `items`, the first ones most often for a skew above 1."""
+    return items[int(len(items) * rng.random() ** skew)]
+
+
+def generate_users(rng, count, staff, password, seed, now):
+    for number in range(count):
+        is_staff = number < staff
+        kind = "staff" if is_staff else "user"
+        yield (
+            f"{kind}{number}@s{seed}.example.com",
+            password,
+            rng.choice(TITLE_WORDS),
+            rng.choice(SURNAMES),
+            is_staff,
+            False,
+            True,
+            now - timedelta(days=rng.randrange(3650)),
+        )
+
+
+def generate_books(rng, count, now):
+    for number in range(count):
+        words = rng.sample(TITLE_WORDS, rng.randint(1, 3))
+        yield (
+            f"{' '.join(words)} {number}",
+            f"{rng.choice(TITLE_WORDS)} {rng.choice(SURNAMES)}",
+            rng.choice(Book.CoverChoices.values),
+            rng.randint(0, 12),
+            Decimal(rng.randrange(50, 500)) / 100,
+            0,
+            0,
+            now,
+        )
+
+
+def generate_borrowings(rng, count, user_ids, book_ids, today, days, overdue, now):
+    """
+    Borrow dates spread evenly over the last `days` days. Popular books and
+    heavy readers are picked far more often, most loans are returned within
+    a few weeks, recent ones are still out and an `overdue` share of the
+    older ones was never returned.
+    """
+    for _ in range(count):
+        age = rng.randrange(days)
+        borrow_date = today - timedelta(days=age)
+        returned = None
+        if age > LOAN_DAYS * 2 * rng.random() and rng.random() >= overdue:
+            loan = min(int(rng.expovariate(1 / LOAN_DAYS)), age)
+            returned = borrow_date + timedelta(days=loan)
+        yield (
+            _skewed(rng, user_ids, 2),
+            _skewed(rng, book_ids, 3),
+            borrow_date,
+            borrow_date + timedelta(days=LOAN_DAYS),
+            returned,
+            now,
+        )
+
+
+def _ids_after(model, after):
+    return list(
+        model.objects.filter(pk__gt=after).order_by("pk").values_list("pk", flat=True)
+    )
+
+
+def _last_id(model):
+    return model.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+
+def generate_dataset(
+    seed,
+    users,
+    books,
+    borrowings,
+    staff=0,
+    days=730,
+    overdue=0.03,
+    today=None,
+    batch_size=BATCH_SIZE,
+):
+    """
+    Insert users, books and borrowings generated from `seed`; the same seed
+    gives the same rows. The password is hashed once and the hash shared.
+    Yield (model, rows, seconds) after every table.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    today = today or timezone.localdate()
+    user_model = get_user_model()
+
+    started = time.perf_counter()
+    after = _last_id(user_model)
+    rows = generate_users(rng, users, staff, make_password(PASSWORD), seed, now)
+    count = insert_rows(user_model, USER_FIELDS, rows, batch_size)
+    user_ids = _ids_after(user_model, after)
+    yield user_model, count, time.perf_counter() - started
+
+    started = time.perf_counter()
+    after = _last_id(Book)
+    count = insert_rows(Book, BOOK_FIELDS, generate_books(rng, books, now), batch_size)
+    book_ids = _ids_after(Book, after)
+    yield Book, count, time.perf_counter() - started
+
+    started = time.perf_counter()
+    rows = generate_borrowings(
+        rng, borrowings, user_ids, book_ids, today, days, overdue, now
+    )
+    count = insert_rows(Borrowing, BORROWING_FIELDS, rows, batch_size)
+    yield Borrowing, count, time.perf_counter() - started
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management import BaseCommand
+
+from borrowing.filters import date_argument
+from borrowing.fines import CHUNK_SIZE, accrue_fines
+
+
+class Command(BaseCommand):
+    """Django command to charge fines on overdue borrowings"""
+
+    help = (
+        "Scan active borrowings past their expected return date in chunks "
+        "and create or refresh their fines. Safe to rerun; resume an "
+        "interrupted scan with --after-id."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--after-id", type=int, default=0)
+        parser.add_argument(
+            "--date", type=date_argument, help="Scan as of this date (YYYY-MM-DD)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = 0
+        for last_id, count in accrue_fines(
+            options["date"], options["chunk_size"], options["after_id"]
+        ):
+            written += count
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{written} fines written, last borrowing {last_id}")
+
+        elapsed = time.perf_counter() - started
+        rate = round(written / elapsed) if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Accrued {written} fines in {elapsed:.2f}s ({rate} rows/s)"
+            )
+        )
@@ -0,0 +1,114 @@
+import json
+from datetime import datetime, timezone
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from library_service_project.benchmarks import SCENARIOS, Benchmark, budget_failures
+
+
+class Command(BaseCommand):
+    """Django command to check the API against query and latency budgets"""
+
+    help = (
+        "Seed a test database with datasets of growing size, call every "
+        "benchmarked endpoint with cold caches, write the query counts and "
+        "latencies as JSON and fail when a budget is exceeded."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,50000",
+            help="Comma separated book counts, borrowings are twice as many",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--output", default="benchmark-results.json")
+        parser.add_argument(
+            "--baseline", help="Results of an earlier run to compare against"
+        )
+        parser.add_argument(
+            "--latency-factor",
+            type=float,
+            default=1.0,
+            help="Scale the latency budgets, e.g. for slower machines",
+        )
+        parser.add_argument(
+            "--no-latency-budgets",
+            action="store_true",
+            help="Only enforce the query budgets",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options["sizes"].split(",")})
+        except ValueError:
+            raise CommandError("--sizes must be comma separated numbers.")
+        if not sizes or sizes[0] < 1 or options["repeat"] < 1:
+            raise CommandError("--sizes and --repeat must be positive.")
+
+        setup_test_environment(debug=False)
+        old_config = setup_databases(
+            verbosity=0, interactive=False, aliases={"default"}
+        )
+        try:
+            results = []
+            for result in Benchmark(SCENARIOS, options["repeat"]).run(sizes):
+                self.stdout.write(
+                    f"{result['scenario']} ({result['size']}): "
+                    f"{result['queries']} queries, p50={result['p50_ms']:.1f}ms "
+                    f"p95={result['p95_ms']:.1f}ms"
+                )
+                results.append(result)
+            vendor = connection.vendor
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        with open(options["output"], "w") as output:
+            json.dump(
+                {
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "database": vendor,
+                    "repeat": options["repeat"],
+                    "results": results,
+                },
+                output,
+                indent=2,
+            )
+        self.stdout.write(f"Wrote {len(results)} results to {options['output']}")
+
+        if options["baseline"]:
+            self.compare(options["baseline"], results)
+
+        latency_factor = None
+        if not options["no_latency_budgets"]:
+            latency_factor = options["latency_factor"]
+        failures = budget_failures(results, latency_factor)
+        if failures:
+            raise CommandError("Budgets exceeded:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All budgets met."))
+
+    def compare(self, path, results):
+        with open(path) as baseline_file:
+            baseline = {
+                (result["scenario"], result["size"]): result
+                for result in json.load(baseline_file)["results"]
+            }
+        for result in results:
+            before = baseline.get((result["scenario"], result["size"]))
+            if before is None:
+                continue
+            change = (result["p50_ms"] / before["p50_ms"] - 1) * 100
+            self.stdout.write(
+                f"{result['scenario']} ({result['size']}): "
+                f"p50 {before['p50_ms']:.1f}ms -> {result['p50_ms']:.1f}ms "
+                f"({change:+.0f}%), queries {before['queries']} -> "
+                f"{result['queries']}"
+            )
@@ -0,0 +1,55 @@
+import statistics
+import time
+
+from django.core.management import BaseCommand
+from django.db import connections
+
+
+class Command(BaseCommand):
+    """Django command to measure the cost of opening database connections"""
+
+    help = (
+        "Time a trivial query on a fresh connection per request and on a "
+        "reused one. With DB_POOL=true the fresh connection comes from the "
+        "pool, so running it with and without the pool shows the setup cost "
+        "the pool removes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queries", type=int, default=500)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if getattr(connection, "pool", None) is not None:
+            per_request = "pooled connection per request"
+        else:
+            per_request = "new connection per request"
+
+        self.report(per_request, self.measure(connection, options["queries"], True))
+        self.report(
+            "persistent connection", self.measure(connection, options["queries"], False)
+        )
+
+    @staticmethod
+    def measure(connection, queries, reconnect):
+        connection.close()
+        timings = []
+        for _ in range(queries):
+            if reconnect:
+                # Release the connection like the end of a request does.
+                connection.close()
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            timings.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        return timings
+
+    def report(self, name, timings):
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{name}: p50={percentiles[49]:.3f}ms p99={percentiles[98]:.3f}ms "
+            f"mean={statistics.fmean(timings):.3f}ms"
+        )
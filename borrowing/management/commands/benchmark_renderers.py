@@ -0,0 +1,62 @@
+import statistics
+import time
+
+from django.core.management import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from books.serializers import BookSerializer
+from borrowing.models import Borrowing
+from borrowing.serializers import BorrowingSerializer
+from library_service_project.fields import ValuesPlan
+from library_service_project.renderers import MessagePackRenderer, OrjsonRenderer
+
+RENDERERS = (
+    ("json", JSONRenderer),
+    ("orjson", OrjsonRenderer),
+    ("msgpack", MessagePackRenderer),
+)
+
+
+class Command(BaseCommand):
+    """Django command to compare the response renderers on large lists"""
+
+    help = (
+        "Render the first --rows books and borrowings (with user and book "
+        "expanded) with DRF's JSONRenderer, the orjson renderer and the "
+        "MessagePack renderer, and report the time and size of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+        cases = (
+            ("books", BookSerializer(), Book.objects.order_by("id")),
+            (
+                "borrowings",
+                BorrowingSerializer(expand=["user", "book"]),
+                Borrowing.objects.order_by("-id"),
+            ),
+        )
+        for name, serializer, queryset in cases:
+            plan = ValuesPlan(serializer)
+            data = [
+                plan.serialize(row) for row in plan.values(queryset[: options["rows"]])
+            ]
+            results = []
+            for format_name, renderer_class in RENDERERS:
+                renderer = renderer_class()
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    content = renderer.render(data)
+                    timings.append((time.perf_counter() - started) * 1000)
+                results.append(
+                    f"{format_name} {statistics.median(timings):.1f}ms "
+                    f"{len(content)} bytes"
+                )
+            self.stdout.write(f"{name} ({len(data)} rows): {', '.join(results)}")
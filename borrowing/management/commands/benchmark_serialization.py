@@ -0,0 +1,85 @@
+import statistics
+import time
+
+from django.core.management import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from books.serializers import BookSerializer
+from borrowing.models import Borrowing
+from borrowing.serializers import BorrowingSerializer
+from library_service_project.fields import ValuesPlan
+
+
+def serializer_render(serializer_class, queryset, options):
+    serializer = serializer_class(**options)
+    objects = serializer.trim_queryset(queryset)
+    return JSONRenderer().render(serializer_class(objects, many=True, **options).data)
+
+
+def values_render(serializer_class, queryset, options):
+    plan = ValuesPlan(serializer_class(**options))
+    return JSONRenderer().render([plan.serialize(row) for row in plan.values(queryset)])
+
+
+class Command(BaseCommand):
+    """Django command to compare serializer and values() list rendering"""
+
+    help = (
+        "Render the first --rows books and borrowings to JSON through the "
+        "serializers and through ValuesPlan, check that the output is the "
+        "same and report the time of each path."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument(
+            "--expand", action="store_true", help="Nest users and books"
+        )
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be positive.")
+        borrowing_options = {"expand": ["user", "book"]} if options["expand"] else {}
+        cases = (
+            ("books", BookSerializer, Book.objects.order_by("id"), {}),
+            (
+                "borrowings",
+                BorrowingSerializer,
+                Borrowing.objects.order_by("-id"),
+                borrowing_options,
+            ),
+        )
+        for name, serializer_class, queryset, serializer_options in cases:
+            queryset = queryset[: options["rows"]]
+            expected = serializer_render(serializer_class, queryset, serializer_options)
+            if (
+                values_render(serializer_class, queryset, serializer_options)
+                != expected
+            ):
+                raise CommandError(f"{name}: the values() output differs.")
+
+            timings = {}
+            for path, render in (
+                ("serializer", serializer_render),
+                ("values", values_render),
+            ):
+                timings[path] = self.measure(
+                    render, serializer_class, queryset, serializer_options, options
+                )
+            self.stdout.write(
+                f"{name} ({queryset.count()} rows, {len(expected)} bytes): "
+                f"serializer {timings['serializer']:.1f}ms, "
+                f"values {timings['values']:.1f}ms, "
+                f"{timings['serializer'] / timings['values']:.1f}x"
+            )
+
+    @staticmethod
+    def measure(render, serializer_class, queryset, serializer_options, options):
+        timings = []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            render(serializer_class, queryset, serializer_options)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management import BaseCommand
+
+from borrowing.exporting import (
+    CHUNK_SIZE,
+    FILE_FORMATS,
+    export_borrowings,
+    filter_borrowings,
+)
+from borrowing.filters import date_argument
+from borrowing.models import ArchivedBorrowing, Borrowing
+
+
+class Command(BaseCommand):
+    """Django command to export the borrowing history"""
+
+    help = (
+        "Stream the borrowing history, archived borrowings included, to a "
+        "CSV or JSONL file, or to stdout when no path is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?")
+        parser.add_argument(
+            "--format", choices=FILE_FORMATS, default="csv", dest="file_format"
+        )
+        parser.add_argument("--user", type=int, dest="user_id")
+        parser.add_argument("--after", dest="borrowed_after", type=date_argument)
+        parser.add_argument("--before", dest="borrowed_before", type=date_argument)
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        filters = {
+            "user_id": options["user_id"],
+            "borrowed_after": options["borrowed_after"],
+            "borrowed_before": options["borrowed_before"],
+        }
+        blocks = export_borrowings(
+            filter_borrowings(Borrowing.objects.all(), **filters),
+            options["file_format"],
+            options["chunk_size"],
+            archived=filter_borrowings(ArchivedBorrowing.objects.all(), **filters),
+        )
+
+        started = time.perf_counter()
+        if options["path"] is None:
+            for block in blocks:
+                self.stdout.write(block, ending="")
+            return
+
+        with open(options["path"], "w", encoding="utf-8", newline="") as stream:
+            for block in blocks:
+                stream.write(block)
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Exported borrowings to {options['path']} "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+        )
@@ -0,0 +1,68 @@
+from django.core.management import BaseCommand, CommandError, call_command
+
+from books.cache import bump_catalogue_version
+from borrowing.generating import BATCH_SIZE, PASSWORD, generate_dataset
+
+
+class Command(BaseCommand):
+    """Django command to fill the database with a synthetic dataset"""
+
+    help = (
+        "Insert generated users, books and borrowings, the same ones for the "
+        "same --seed: a few staff accounts, popular titles and heavy readers, "
+        "loans returned after a few weeks and a tail of overdue ones. Then "
+        "recount the book counters and rebuild the daily rollups. Every user "
+        f"has the password {PASSWORD!r}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--books", type=int, default=10000)
+        parser.add_argument("--borrowings", type=int, default=100000)
+        parser.add_argument("--staff", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--days", type=int, default=730, help="Days of borrowing history"
+        )
+        parser.add_argument(
+            "--overdue",
+            type=float,
+            default=0.03,
+            help="Share of older borrowings never returned",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--skip-derived",
+            action="store_true",
+            help="Leave the book counters and daily rollups as they are",
+        )
+
+    def handle(self, *args, **options):
+        if min(options["users"], options["books"], options["days"]) < 1:
+            raise CommandError("--users, --books and --days must be positive.")
+        if options["borrowings"] < 0 or options["batch_size"] < 1:
+            raise CommandError("--borrowings and --batch-size must be positive.")
+        if not 0 <= options["staff"] <= options["users"]:
+            raise CommandError("--staff must be between 0 and --users.")
+        if not 0 <= options["overdue"] <= 1:
+            raise CommandError("--overdue must be between 0 and 1.")
+
+        for model, rows, seconds in generate_dataset(
+            options["seed"],
+            options["users"],
+            options["books"],
+            options["borrowings"],
+            staff=options["staff"],
+            days=options["days"],
+            overdue=options["overdue"],
+            batch_size=options["batch_size"],
+        ):
+            self.stdout.write(
+                f"Inserted {rows} {model._meta.verbose_name_plural} in "
+                f"{seconds:.2f}s ({rows / max(seconds, 1e-9):.0f} rows/s)"
+            )
+        bump_catalogue_version()
+
+        if not options["skip_derived"]:
+            call_command("recount_book_borrowings", stdout=self.stdout)
+            call_command("rebuild_borrowing_stats", stdout=self.stdout)
@@ -0,0 +1,57 @@
+import time
+from datetime import date
+
+from django.core.management import BaseCommand, CommandError
+from django.db.models import Min
+
+from borrowing.filters import date_argument
+from borrowing.models import ArchivedBorrowing, Borrowing
+from borrowing.stats import WINDOW_DAYS, rebuild_stats
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the daily borrowing rollups"""
+
+    help = (
+        "Recompute the daily book and user borrowing rollups from the live and "
+        "archived borrowings, by default from the first borrowing until today."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=date_argument)
+        parser.add_argument("--end", type=date_argument)
+        parser.add_argument("--window-days", type=int, default=WINDOW_DAYS)
+
+    def handle(self, *args, **options):
+        if options["window_days"] < 1:
+            raise CommandError("--window-days must be positive.")
+        end = options["end"] or date.today()
+        start = options["start"]
+        if start is None:
+            start = min(
+                filter(
+                    None,
+                    (
+                        model.objects.aggregate(first=Min("borrow_date"))["first"]
+                        for model in (Borrowing, ArchivedBorrowing)
+                    ),
+                ),
+                default=None,
+            )
+        if start is None:
+            self.stdout.write("No borrowings to roll up.")
+            return
+
+        started = time.perf_counter()
+        windows = 0
+        for first, last in rebuild_stats(start, end, options["window_days"]):
+            windows += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Rebuilt {first} - {last}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {start} - {end} in {windows} windows "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+        )
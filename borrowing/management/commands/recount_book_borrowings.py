@@ -0,0 +1,45 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from books.models import Book
+from borrowing.models import Borrowing
+
+
+class Command(BaseCommand):
+    """Django command to repair the borrowing counters on books"""
+
+    help = (
+        "Recount active and total borrowings and the last borrow date of "
+        "every book in chunks, saving only the books whose counters drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        started = time.perf_counter()
+        checked = repaired = 0
+        last_id = 0
+        while True:
+            book_ids = list(
+                Book.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not book_ids:
+                break
+            repaired += Borrowing.objects.recount_books(book_ids)
+            checked += len(book_ids)
+            last_id = book_ids[-1]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} books in "
+                f"{time.perf_counter() - started:.2f}s, repaired {repaired}"
+            )
+        )
@@ -1,20 +1,43 @@
 import time
 from django.db import connections
 from django.db.utils import OperationalError
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
 
 
 class Command(BaseCommand):
     """Django command to pause execution until db is available"""
 
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--timeout", type=float, default=60, help="Seconds to wait in total"
+        )
+        parser.add_argument(
+            "--max-delay", type=float, default=5, help="Longest pause between probes"
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
-        db_conn = None
-        while not db_conn:
+        connection = connections[options["database"]]
+        deadline = time.monotonic() + options["timeout"]
+        delay = 0.1
+        while True:
             try:
-                db_conn = connections["default"]
-            except OperationalError:
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                break
+            except OperationalError as error:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f"Database unavailable after {options['timeout']:g}s: {error}"
+                    )
+                pause = min(delay, options["max_delay"], remaining)
+                self.stdout.write(
+                    f"Database unavailable, waiting {pause:.1f} seconds..."
+                )
+                time.sleep(pause)
+                delay *= 2
 
+        connection.close()
         self.stdout.write(self.style.SUCCESS("Database available!"))
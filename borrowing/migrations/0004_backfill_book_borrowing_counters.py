@@ -0,0 +1,45 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:04
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Book = apps.get_model("books", "Book")
+    Borrowing = apps.get_model("borrowing", "Borrowing")
+
+    borrowings = Borrowing.objects.filter(book=OuterRef("pk")).order_by().values("book")
+    Book.objects.update(
+        active_borrowings=Coalesce(
+            Subquery(
+                borrowings.filter(actual_return_date__isnull=True)
+                .annotate(count=Count("pk"))
+                .values("count"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        total_borrowings=Coalesce(
+            Subquery(
+                borrowings.annotate(count=Count("pk")).values("count"),
+                output_field=IntegerField(),
+            ),
+            0,
+        ),
+        last_borrow_date=Subquery(
+            borrowings.annotate(last=Max("borrow_date")).values("last")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0005_book_borrowing_counters"),
+        ("borrowing", "0003_borrowing_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowing", "0004_backfill_book_borrowing_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Fine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("days_overdue", models.PositiveIntegerField()),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=8)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("Pending", "Pending"), ("Paid", "Paid")],
+                        default="Pending",
+                        max_length=7,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "borrowing",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fine",
+                        to="borrowing.borrowing",
+                    ),
+                ),
+            ],
+        ),
+    ]
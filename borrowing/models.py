@@ -1,22 +1,309 @@
+from collections import Counter, defaultdict
 from datetime import date
+from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Case, Count, F, Max, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from books.cache import bump_catalogue_version
 from books.models import Book
 
 
+def _per_book(counts):
+    """Build a CASE expression that maps book ids to the given counts."""
+    return Case(
+        *[When(pk=pk, then=Value(count)) for pk, count in counts.items()],
+        default=Value(0),
+    )
+
+
+def rental_fee(daily_fee, borrow_date, return_date):
+    """Fee of a borrowing returned on `return_date`, at least one day."""
+    daily_fee = Book._meta.get_field("daily_fee").to_python(daily_fee)
+    return daily_fee * max((return_date - borrow_date).days, 1)
+
+
+def _record_stats(day, borrowed=(), returned=()):
+    """
+    Add the borrows and returns of `day` to the daily book and user rollups.
+    `borrowed` holds (book id, user id) and `returned` (book id, user id, fee).
+    """
+    for model, position in ((BookDailyStats, 0), (UserDailyStats, 1)):
+        totals = defaultdict(lambda: [0, 0, Decimal("0")])
+        for item in borrowed:
+            totals[item[position]][0] += 1
+        for item in returned:
+            totals[item[position]][1] += 1
+            totals[item[position]][2] += item[2]
+        model.objects.add(day, totals)
+
+
+class BorrowingManager(models.Manager):
+    """
+    Borrow and return books with atomic inventory changes. The borrowing
+    counters on Book are updated in the same statement as the inventory.
+    """
+
+    def borrow(self, user, book, expected_return_date):
+        """
+        Reserve a copy of the book and create the borrowing in one transaction.
+        Return None if the book is out of stock.
+        """
+        with transaction.atomic(using=self.db):
+            reserved = Book.objects.filter(pk=book.pk, inventory__gt=0).update(
+                inventory=F("inventory") - 1,
+                active_borrowings=F("active_borrowings") + 1,
+                total_borrowings=F("total_borrowings") + 1,
+                last_borrow_date=date.today(),
+                updated_at=timezone.now(),
+            )
+            if not reserved:
+                return None
+            bump_catalogue_version()
+            borrowing = self.create(
+                user=user, book=book, expected_return_date=expected_return_date
+            )
+            _record_stats(borrowing.borrow_date, borrowed=[(book.pk, user.pk)])
+        return borrowing
+
+    def return_book(self, borrowing):
+        """
+        Close the borrowing and put the copy back in stock in one transaction.
+        Return False if the borrowing has already been returned.
+        """
+        return_date = date.today()
+        with transaction.atomic(using=self.db):
+            returned = self.filter(
+                pk=borrowing.pk, actual_return_date__isnull=True
+            ).update(actual_return_date=return_date, updated_at=timezone.now())
+            if not returned:
+                return False
+            Book.objects.filter(pk=borrowing.book_id).update(
+                inventory=F("inventory") + 1,
+                active_borrowings=Greatest(F("active_borrowings") - 1, 0),
+                updated_at=timezone.now(),
+            )
+            bump_catalogue_version()
+            fee = rental_fee(
+                borrowing.book.daily_fee, borrowing.borrow_date, return_date
+            )
+            _record_stats(
+                return_date, returned=[(borrowing.book_id, borrowing.user_id, fee)]
+            )
+        borrowing.actual_return_date = return_date
+        return True
+
+    def bulk_borrow(self, user, items):
+        """
+        Borrow several books in one transaction with a single inventory UPDATE
+        and a single INSERT. `items` are dicts with `book` (an id) and
+        `expected_return_date`. Return, in order, the created borrowing or an
+        error message for every item.
+        """
+        with transaction.atomic(using=self.db):
+            books = Book.objects.select_for_update().in_bulk(
+                {item["book"] for item in items}
+            )
+            available = {pk: book.inventory for pk, book in books.items()}
+            reserved = Counter()
+            results = []
+            for item in items:
+                book = books.get(item["book"])
+                if book is None:
+                    results.append(f"Book {item['book']} does not exist")
+                elif available[book.pk] - reserved[book.pk] < 1:
+                    results.append(f"{book.title} is out of stock")
+                else:
+                    reserved[book.pk] += 1
+                    results.append(
+                        self.model(
+                            user=user,
+                            book=book,
+                            expected_return_date=item["expected_return_date"],
+                        )
+                    )
+
+            if reserved:
+                Book.objects.filter(pk__in=reserved).update(
+                    inventory=F("inventory") - _per_book(reserved),
+                    active_borrowings=F("active_borrowings") + _per_book(reserved),
+                    total_borrowings=F("total_borrowings") + _per_book(reserved),
+                    last_borrow_date=date.today(),
+                    updated_at=timezone.now(),
+                )
+                bump_catalogue_version()
+                borrowings = self.bulk_create(
+                    [result for result in results if isinstance(result, self.model)]
+                )
+                _record_stats(
+                    date.today(),
+                    borrowed=[(borrowing.book_id, user.pk) for borrowing in borrowings],
+                )
+        return results
+
+    def bulk_return(self, user, borrowing_ids):
+        """
+        Return several borrowings in one transaction with one UPDATE of the
+        borrowings and one of the inventory. Non-staff users may only return
+        their own borrowings. Return, in order, None for every returned
+        borrowing or an error message.
+        """
+        return_date = date.today()
+        queryset = self.select_for_update().filter(pk__in=borrowing_ids)
+        if not user.is_staff:
+            queryset = queryset.filter(user=user)
+
+        with transaction.atomic(using=self.db):
+            found = {
+                row[0]: row[1:]
+                for row in queryset.values_list(
+                    "pk",
+                    "book_id",
+                    "actual_return_date",
+                    "user_id",
+                    "borrow_date",
+                    "book__daily_fee",
+                )
+            }
+            returned = set()
+            restocked = Counter()
+            fees = []
+            results = []
+            for pk in borrowing_ids:
+                if pk not in found:
+                    results.append(f"Borrowing {pk} does not exist")
+                elif found[pk][1] is not None or pk in returned:
+                    results.append("The book has already been returned")
+                else:
+                    book_id, _, user_id, borrow_date, daily_fee = found[pk]
+                    returned.add(pk)
+                    restocked[book_id] += 1
+                    fees.append(
+                        (
+                            book_id,
+                            user_id,
+                            rental_fee(daily_fee, borrow_date, return_date),
+                        )
+                    )
+                    results.append(None)
+
+            if returned:
+                self.filter(pk__in=returned).update(
+                    actual_return_date=return_date, updated_at=timezone.now()
+                )
+                Book.objects.filter(pk__in=restocked).update(
+                    inventory=F("inventory") + _per_book(restocked),
+                    active_borrowings=Greatest(
+                        F("active_borrowings") - _per_book(restocked), 0
+                    ),
+                    updated_at=timezone.now(),
+                )
+                bump_catalogue_version()
+                _record_stats(return_date, returned=fees)
+        return results
+
+    def recount_books(self, book_ids):
+        """
+        Recount the borrowing counters of the given books from their live and
+        archived borrowings and save the ones that drifted. Return how many
+        were fixed. The books stay locked from the count to the save, so a
+        concurrent borrow or return waits instead of being overwritten.
+        """
+        with transaction.atomic(using=self.db):
+            books = list(
+                Book.objects.select_for_update()
+                .filter(pk__in=book_ids)
+                .order_by("pk")
+                .only("active_borrowings", "total_borrowings", "last_borrow_date")
+            )
+            counted = {
+                row["book"]: row
+                for row in self.filter(book__in=book_ids)
+                .order_by()
+                .values("book")
+                .annotate(
+                    active=Count("pk", filter=Q(actual_return_date__isnull=True)),
+                    total=Count("pk"),
+                    last=Max("borrow_date"),
+                )
+            }
+            # Archived borrowings are returned, so they only add to the totals.
+            for row in (
+                ArchivedBorrowing.objects.filter(book__in=book_ids)
+                .order_by()
+                .values("book")
+                .annotate(total=Count("pk"), last=Max("borrow_date"))
+            ):
+                live = counted.setdefault(row["book"], {"active": 0, "total": 0})
+                live["total"] += row["total"]
+                live["last"] = max(filter(None, (live.get("last"), row["last"])))
+
+            drifted = []
+            for book in books:
+                row = counted.get(book.pk, {})
+                counters = (row.get("active", 0), row.get("total", 0), row.get("last"))
+                if counters != (
+                    book.active_borrowings,
+                    book.total_borrowings,
+                    book.last_borrow_date,
+                ):
+                    (
+                        book.active_borrowings,
+                        book.total_borrowings,
+                        book.last_borrow_date,
+                    ) = counters
+                    book.updated_at = timezone.now()
+                    drifted.append(book)
+
+            if drifted:
+                Book.objects.bulk_update(
+                    drifted,
+                    [
+                        "active_borrowings",
+                        "total_borrowings",
+                        "last_borrow_date",
+                        "updated_at",
+                    ],
+                )
+                bump_catalogue_version()
+        return len(drifted)
+
+
 class Borrowing(models.Model):
+    # The user and book lookups are served by the composite indexes below.
     user = models.ForeignKey(
         get_user_model(),
         on_delete=models.CASCADE,
+        db_index=False,
     )
-    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, db_index=False)
     borrow_date = models.DateField(auto_now_add=True)
     expected_return_date = models.DateField()
     actual_return_date = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BorrowingManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_idx",
+            ),
+            models.Index(
+                fields=["user", "borrow_date"], name="borrowing_user_date_idx"
+            ),
+            models.Index(
+                fields=["book", "actual_return_date"],
+                name="borrowing_book_return_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} borrowed {self.book}: {self.borrow_date}"
@@ -40,3 +327,157 @@ class Borrowing(models.Model):
             self.borrow_date = date.today()
         self.clean()
         super().save(*args, **kwargs)
+
+
+class ArchivedBorrowing(models.Model):
+    """
+    A borrowing returned long ago, moved out of Borrowing with its id by the
+    `archive_borrowings` command so the live table stays small. The amount
+    of its paid fine, if any, is kept with it.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    # The user and book lookups are served by the composite indexes below.
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="archived_borrowings",
+        db_index=False,
+    )
+    book = models.ForeignKey(
+        Book,
+        on_delete=models.CASCADE,
+        related_name="archived_borrowings",
+        db_index=False,
+    )
+    borrow_date = models.DateField()
+    expected_return_date = models.DateField()
+    actual_return_date = models.DateField()
+    fine_amount = models.DecimalField(
+        max_digits=8, decimal_places=2, null=True, blank=True
+    )
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "id"], name="archived_user_id_idx"),
+            models.Index(fields=["book", "borrow_date"], name="archived_book_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} borrowed {self.book}: {self.borrow_date} (archived)"
+
+    @property
+    def is_active(self):
+        return False
+
+
+class Fine(models.Model):
+    """Overdue fine of a borrowing, accrued by the `accrue_fines` command."""
+
+    class StatusChoices(models.TextChoices):
+        PENDING = "Pending"
+        PAID = "Paid"
+
+    borrowing = models.OneToOneField(
+        Borrowing, on_delete=models.CASCADE, related_name="fine"
+    )
+    days_overdue = models.PositiveIntegerField()
+    amount = models.DecimalField(max_digits=8, decimal_places=2)
+    status = models.CharField(
+        max_length=7, choices=StatusChoices.choices, default=StatusChoices.PENDING
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.borrowing}: {self.amount} ({self.status})"
+
+
+class DailyStatsManager(models.Manager):
+    def add(self, day, totals):
+        """
+        Add borrows, returns and revenue to the rollups of `day` in one upsert.
+        `totals` maps the key id (book or user) to [borrows, returns, revenue].
+        """
+        if not totals:
+            return
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        key = self.model._meta.get_field(self.model.key_field).column
+        table = quote(self.model._meta.db_table)
+        counters = ("borrows", "returns", "revenue")
+
+        params = []
+        for key_id, (borrows, returns, revenue) in totals.items():
+            params += [
+                connection.ops.adapt_datefield_value(day),
+                key_id,
+                borrows,
+                returns,
+                connection.ops.adapt_decimalfield_value(revenue),
+            ]
+        columns = ", ".join(quote(column) for column in ("date", key, *counters))
+        values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(totals))
+        updates = ", ".join(
+            f"{quote(column)} = {table}.{quote(column)} + excluded.{quote(column)}"
+            for column in counters
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) VALUES {values} "
+                f"ON CONFLICT ({quote(key)}, {quote('date')}) DO UPDATE SET {updates}",
+                params,
+            )
+
+
+class DailyStats(models.Model):
+    """Borrows, returns and rental revenue of one day, maintained on write."""
+
+    date = models.DateField()
+    borrows = models.PositiveIntegerField(default=0)
+    returns = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    objects = DailyStatsManager()
+
+    class Meta:
+        abstract = True
+
+
+class BookDailyStats(DailyStats):
+    key_field = "book"
+
+    # Lookups by book are served by the unique constraint below.
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="daily_stats", db_index=False
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["book", "date"], name="book_daily_stats_unique"
+            ),
+        ]
+        indexes = [models.Index(fields=["date"], name="book_daily_stats_date_idx")]
+
+
+class UserDailyStats(DailyStats):
+    key_field = "user"
+
+    # Lookups by user are served by the unique constraint below.
+    user = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        db_index=False,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"], name="user_daily_stats_unique"
+            ),
+        ]
+        indexes = [models.Index(fields=["date"], name="user_daily_stats_date_idx")]
@@ -0,0 +1,9 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class BorrowingCursorPagination(CursorPagination):
+    ordering = ("-id",)
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
@@ -1,14 +1,29 @@
-from datetime import date
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import BooleanField, ExpressionWrapper, Q
 from rest_framework import serializers
 
 from books.serializers import BookSerializer
 from borrowing.models import Borrowing
+from library_service_project.fields import SparseFieldsMixin
 from user.serializers import UserSerializer
 
+BULK_MAX_ITEMS = 50
+STATS_DEFAULT_DAYS = 30
+
 
-class BorrowingSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
-    book = BookSerializer(read_only=True)
+class BorrowingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    user = serializers.PrimaryKeyRelatedField(read_only=True)
+    book = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    expandable_fields = {"user": UserSerializer, "book": BookSerializer}
+    field_columns = {"is_active": ("actual_return_date",)}
+    field_expressions = {
+        "is_active": ExpressionWrapper(
+            Q(actual_return_date__isnull=True), output_field=BooleanField()
+        )
+    }
 
     class Meta:
         model = Borrowing
@@ -39,3 +54,68 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
                 "Expected return date cannot be earlier than borrowing date."
             )
         return expected_return_date
+
+
+class BorrowingBulkItemSerializer(serializers.Serializer):
+    book = serializers.IntegerField(min_value=1)
+    expected_return_date = serializers.DateField()
+
+    def validate_expected_return_date(self, expected_return_date):
+        if expected_return_date < date.today():
+            raise serializers.ValidationError(
+                "Expected return date cannot be earlier than borrowing date."
+            )
+        return expected_return_date
+
+
+class BorrowingBulkCreateSerializer(serializers.Serializer):
+    items = BorrowingBulkItemSerializer(
+        many=True, allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    borrowings = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+
+
+class BorrowingStatsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    group_by = serializers.ChoiceField(choices=("day", "book", "user"), default="day")
+    book_id = serializers.IntegerField(min_value=1, required=False)
+    user_id = serializers.IntegerField(min_value=1, required=False)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.API_MAX_PAGE_SIZE,
+        default=settings.API_PAGE_SIZE,
+    )
+
+    def validate(self, attrs):
+        attrs.setdefault("end", date.today())
+        attrs.setdefault("start", attrs["end"] - timedelta(days=STATS_DEFAULT_DAYS - 1))
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError(
+                {"start": "Start date cannot be later than end date."}
+            )
+
+        by_book = attrs.get("book_id") or attrs["group_by"] == "book"
+        by_user = attrs.get("user_id") or attrs["group_by"] == "user"
+        if by_book and by_user:
+            raise serializers.ValidationError(
+                "Book and user statistics are kept apart, "
+                "filter or group by one of them."
+            )
+        return attrs
+
+
+class BorrowingStatsSerializer(serializers.Serializer):
+    date = serializers.DateField(required=False)
+    book = serializers.IntegerField(required=False)
+    user = serializers.IntegerField(required=False)
+    borrows = serializers.IntegerField()
+    returns = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
@@ -0,0 +1,112 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from borrowing.functions import DaysBetween
+from borrowing.models import (
+    ArchivedBorrowing,
+    BookDailyStats,
+    Borrowing,
+    UserDailyStats,
+)
+
+WINDOW_DAYS = 31
+GROUPS = ("day", "book", "user")
+
+
+def _rebuild_window(start, end):
+    fee = F("book__daily_fee") * Greatest(
+        DaysBetween(F("borrow_date"), F("actual_return_date")), Value(1)
+    )
+    for model in (BookDailyStats, UserDailyStats):
+        key = f"{model.key_field}_id"
+        totals = defaultdict(lambda: [0, 0, Decimal("0")])
+        # Archived borrowings were moved out of Borrowing, not undone.
+        for source in (Borrowing, ArchivedBorrowing):
+            borrowed = (
+                source.objects.filter(borrow_date__range=(start, end))
+                .order_by()
+                .values_list("borrow_date", key)
+                .annotate(count=Count("pk"))
+            )
+            for day, key_id, count in borrowed:
+                totals[day, key_id][0] += count
+            returned = (
+                source.objects.filter(actual_return_date__range=(start, end))
+                .order_by()
+                .values_list("actual_return_date", key)
+                .annotate(
+                    count=Count("pk"),
+                    revenue=Sum(
+                        fee,
+                        output_field=DecimalField(max_digits=12, decimal_places=2),
+                    ),
+                )
+            )
+            for day, key_id, count, revenue in returned:
+                totals[day, key_id][1] += count
+                totals[day, key_id][2] += revenue
+
+        model.objects.filter(date__range=(start, end)).delete()
+        model.objects.bulk_create(
+            model(
+                date=day,
+                borrows=borrows,
+                returns=returns,
+                revenue=revenue,
+                **{key: key_id},
+            )
+            for (day, key_id), (borrows, returns, revenue) in totals.items()
+        )
+
+
+def rebuild_stats(start, end, window_days=WINDOW_DAYS):
+    """
+    Recompute the daily rollups of the days from `start` to `end` from the
+    live and archived borrowings, one window of days per transaction. Yield
+    every finished window as (first day, last day).
+    """
+    while start <= end:
+        window_end = min(start + timedelta(days=window_days - 1), end)
+        with transaction.atomic():
+            _rebuild_window(start, window_end)
+        yield start, window_end
+        start = window_end + timedelta(days=1)
+
+
+def query_stats(start, end, group_by="day", book_id=None, user_id=None, limit=None):
+    """
+    Sum the rollups between `start` and `end` per day, book or user.
+    Return the overall totals and the grouped rows.
+    """
+    model = UserDailyStats if group_by == "user" or user_id else BookDailyStats
+    queryset = model.objects.filter(date__range=(start, end))
+    if book_id:
+        queryset = queryset.filter(book_id=book_id)
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+
+    sums = {
+        "total_borrows": Coalesce(Sum("borrows"), 0),
+        "total_returns": Coalesce(Sum("returns"), 0),
+        "total_revenue": Coalesce(
+            Sum("revenue"),
+            Value(Decimal("0")),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    }
+    group = "date" if group_by == "day" else group_by
+    rows = queryset.values(group).annotate(**sums)
+    if group_by == "day":
+        rows = rows.order_by("date")
+    else:
+        rows = rows.order_by("-total_borrows", group)[:limit]
+
+    def unprefix(row):
+        return {name.removeprefix("total_"): value for name, value in row.items()}
+
+    return unprefix(queryset.aggregate(**sums)), [unprefix(row) for row in rows]
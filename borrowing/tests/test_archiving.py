@@ -0,0 +1,160 @@
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowing.archiving import archive_borrowings
+from borrowing.models import ArchivedBorrowing, BookDailyStats, Borrowing, Fine
+
+LIST_URL = reverse("borrowing:borrowing-list")
+HISTORY_URL = reverse("borrowing:borrowing-history")
+EXPORT_URL = reverse("borrowing:borrowing-export")
+TODAY = date.today()
+
+
+class ArchiveBorrowingsTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.admin_user = user_model.objects.create_superuser(
+            email="admin@admin.com", password="admin1234pass"
+        )
+        self.user = user_model.objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        self.other_user = user_model.objects.create_user(
+            email="other@user.com", password="user1234pass"
+        )
+        self.book = Book.objects.create(
+            title="Book", author="Author", cover="Hard", inventory=10, daily_fee=1
+        )
+        # (borrowed days ago, returned days ago, fine status)
+        loans = [
+            (500, 480, None),
+            (450, 400, Fine.StatusChoices.PAID),
+            (420, 410, Fine.StatusChoices.PENDING),
+            (30, 20, None),
+            (400, None, None),
+        ]
+        self.borrowings = []
+        for borrowed, returned, fine in loans:
+            borrowing = Borrowing.objects.borrow(
+                self.user, self.book, TODAY + timedelta(days=7)
+            )
+            if returned is not None:
+                Borrowing.objects.return_book(borrowing)
+            Borrowing.objects.filter(pk=borrowing.pk).update(
+                borrow_date=TODAY - timedelta(days=borrowed),
+                expected_return_date=TODAY - timedelta(days=borrowed - 14),
+                actual_return_date=returned and TODAY - timedelta(days=returned),
+            )
+            if fine is not None:
+                Fine.objects.create(
+                    borrowing=borrowing, days_overdue=6, amount=6, status=fine
+                )
+            self.borrowings.append(borrowing)
+        self.other_borrowing = Borrowing.objects.borrow(
+            self.other_user, self.book, TODAY + timedelta(days=7)
+        )
+
+        call_command("recount_book_borrowings", stdout=StringIO())
+        call_command("rebuild_borrowing_stats", stdout=StringIO())
+        self.book.refresh_from_db()
+
+    def rollups(self):
+        return sorted(
+            BookDailyStats.objects.values_list("date", "borrows", "returns", "revenue")
+        )
+
+    def test_archive_old_returned_borrowings(self):
+        rollups = self.rollups()
+        out = StringIO()
+        call_command("archive_borrowings", days=365, chunk_size=1, stdout=out)
+
+        self.assertIn("Archived 2 borrowings", out.getvalue())
+        archived = {
+            archived.id: archived for archived in ArchivedBorrowing.objects.all()
+        }
+        self.assertEqual(set(archived), {self.borrowings[0].id, self.borrowings[1].id})
+        self.assertIsNone(archived[self.borrowings[0].id].fine_amount)
+        self.assertEqual(archived[self.borrowings[1].id].fine_amount, Decimal("6"))
+        self.assertEqual(
+            archived[self.borrowings[0].id].borrow_date,
+            TODAY - timedelta(days=500),
+        )
+        self.assertFalse(Borrowing.objects.filter(pk__in=archived).exists())
+        self.assertFalse(Fine.objects.filter(borrowing__in=archived).exists())
+        # The unpaid fine keeps its borrowing live.
+        self.assertTrue(Fine.objects.filter(borrowing=self.borrowings[2]).exists())
+
+        # Counters and rollups count the archived borrowings.
+        self.assertEqual(Borrowing.objects.recount_books([self.book.id]), 0)
+        call_command("rebuild_borrowing_stats", stdout=StringIO())
+        self.assertEqual(self.rollups(), rollups)
+        self.assertEqual(list(archive_borrowings(365)), [])
+
+    def test_history_merges_live_and_archived_borrowings(self):
+        list(archive_borrowings(365))
+        self.client.force_authenticate(self.user)
+
+        ids = []
+        response = self.client.get(HISTORY_URL, {"page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [borrowing["id"] for borrowing in response.data["results"]]
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            ids, sorted((borrowing.id for borrowing in self.borrowings), reverse=True)
+        )
+
+        response = self.client.get(
+            HISTORY_URL, {"is_active": "false", "fields": "id,is_active,book"}
+        )
+        self.assertEqual(
+            response.data["results"][-1],
+            {"id": self.borrowings[0].id, "book": self.book.id, "is_active": False},
+        )
+        self.assertEqual(len(response.data["results"]), 4)
+
+    def test_list_shows_live_borrowings_and_retrieve_archived_ones(self):
+        list(archive_borrowings(365))
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(LIST_URL, {"is_active": "false"})
+        self.assertEqual(
+            [borrowing["id"] for borrowing in response.data["results"]],
+            [self.borrowings[3].id, self.borrowings[2].id],
+        )
+
+        url = reverse("borrowing:borrowing-detail", args=[self.borrowings[0].id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], self.borrowings[0].id)
+        self.assertFalse(response.data["is_active"])
+
+        self.client.force_authenticate(self.other_user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_includes_archived_borrowings(self):
+        list(archive_borrowings(365))
+        self.client.force_authenticate(self.admin_user)
+
+        response = self.client.get(EXPORT_URL, {"file_format": "jsonl"})
+
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [borrowing.id for borrowing in self.borrowings] + [self.other_borrowing.id],
+        )
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from borrowing.models import Borrowing
+from borrowing.serializers import BorrowingSerializer
+
+ASYNC_BORROWINGS_URL = reverse("borrowing-async:borrowing-list")
+
+
+def auth_headers(user):
+    return {"Authorization": f"Authorize {AccessToken.for_user(user)}"}
+
+
+class AsyncBorrowingViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.admin_user = user_model.objects.create_superuser(
+            email="admin@admin.com", password="admin1234pass"
+        )
+        cls.regular_user = user_model.objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        book = Book.objects.create(
+            title="Book", author="Author", cover="Hard", inventory=5, daily_fee=1.50
+        )
+        cls.borrowings = [
+            Borrowing.objects.create(
+                user=user, book=book, expected_return_date=date.today() + timedelta(7)
+            )
+            for user in (cls.regular_user, cls.admin_user, cls.regular_user)
+        ]
+
+    async def test_list_own_borrowings_newest_first(self):
+        response = await self.async_client.get(
+            ASYNC_BORROWINGS_URL, headers=auth_headers(self.regular_user)
+        )
+
+        self.assertEqual(response.status_code, 200)
+        expected = [self.borrowings[2], self.borrowings[0]]
+        self.assertEqual(
+            response.json()["results"],
+            BorrowingSerializer(expected, many=True).data,
+        )
+
+    async def test_staff_filters_by_user_in_pages(self):
+        response = await self.async_client.get(
+            ASYNC_BORROWINGS_URL,
+            {"user_id": self.regular_user.id, "page_size": 1},
+            headers=auth_headers(self.admin_user),
+        )
+        page = response.json()
+        self.assertEqual(page["results"][0]["id"], self.borrowings[2].id)
+
+        response = await self.async_client.get(
+            page["next"], headers=auth_headers(self.admin_user)
+        )
+        self.assertEqual(
+            [borrowing["id"] for borrowing in response.json()["results"]],
+            [self.borrowings[0].id],
+        )
+
+    async def test_retrieve_is_limited_to_own_borrowings(self):
+        url = reverse("borrowing-async:borrowing-detail", args=[self.borrowings[1].id])
+        response = await self.async_client.get(
+            url, headers=auth_headers(self.regular_user)
+        )
+        self.assertEqual(response.status_code, 404)
+
+        response = await self.async_client.get(
+            url, headers=auth_headers(self.admin_user)
+        )
+        self.assertEqual(response.json()["id"], self.borrowings[1].id)
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(ASYNC_BORROWINGS_URL)
+        self.assertEqual(response.status_code, 401)
+
+        response = await self.async_client.get(
+            ASYNC_BORROWINGS_URL, headers={"Authorization": "Authorize invalid"}
+        )
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get(
+            ASYNC_BORROWINGS_URL,
+            {"borrowed_after": "someday"},
+            headers=auth_headers(self.regular_user),
+        )
+        self.assertEqual(response.status_code, 400)
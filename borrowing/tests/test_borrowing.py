@@ -6,7 +6,14 @@ from rest_framework.test import APITestCase, APIClient
 from books.models import Book
 from borrowing.models import Borrowing
 from borrowing.serializers import BorrowingSerializer
-from datetime import date
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+RETURN_DATE = date.today() + timedelta(days=30)
 
 
 class BorrowingTests(APITestCase):
@@ -38,12 +45,12 @@ class BorrowingTests(APITestCase):
         self.borrowing1 = Borrowing.objects.create(
             user=self.regular_user,
             book=self.book1,
-            expected_return_date=date(2024, 12, 31),
+            expected_return_date=RETURN_DATE,
         )
         self.borrowing2 = Borrowing.objects.create(
             user=self.regular_user,
             book=self.book2,
-            expected_return_date=date(2024, 12, 31),
+            expected_return_date=RETURN_DATE,
         )
 
         self.client = APIClient()
@@ -52,15 +59,15 @@ class BorrowingTests(APITestCase):
     def test_list_borrowings(self):
         url = reverse("borrowing:borrowing-list")
         response = self.client.get(url, format="json")
-        borrowings = Borrowing.objects.all()
+        borrowings = Borrowing.objects.order_by("-id")
         serializer = BorrowingSerializer(borrowings, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data["results"], serializer.data)
 
     def test_create_borrowing(self):
         self.client.force_authenticate(user=self.regular_user)
         url = reverse("borrowing:borrowing-list")
-        data = {"book": self.book1.id, "expected_return_date": "2024-12-31"}
+        data = {"book": self.book1.id, "expected_return_date": str(RETURN_DATE)}
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Borrowing.objects.count(), 3)
@@ -76,19 +83,26 @@ class BorrowingTests(APITestCase):
 
     def test_update_borrowing(self):
         url = reverse("borrowing:borrowing-detail", kwargs={"pk": self.borrowing1.pk})
-        data = {"book": self.book1.id, "expected_return_date": "2024-12-30"}
+        data = {
+            "book": self.book1.id,
+            "expected_return_date": str(RETURN_DATE - timedelta(days=1)),
+        }
         response = self.client.put(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.borrowing1.refresh_from_db()
-        self.assertEqual(self.borrowing1.expected_return_date, date(2024, 12, 30))
+        self.assertEqual(
+            self.borrowing1.expected_return_date, RETURN_DATE - timedelta(days=1)
+        )
 
     def test_partial_update_borrowing(self):
         url = reverse("borrowing:borrowing-detail", kwargs={"pk": self.borrowing1.pk})
-        data = {"expected_return_date": "2024-12-29"}
+        data = {"expected_return_date": str(RETURN_DATE - timedelta(days=2))}
         response = self.client.patch(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.borrowing1.refresh_from_db()
-        self.assertEqual(self.borrowing1.expected_return_date, date(2024, 12, 29))
+        self.assertEqual(
+            self.borrowing1.expected_return_date, RETURN_DATE - timedelta(days=2)
+        )
 
     def test_delete_borrowing(self):
         url = reverse("borrowing:borrowing-detail", kwargs={"pk": self.borrowing1.pk})
@@ -111,10 +125,267 @@ class BorrowingTests(APITestCase):
         self.book1.inventory = 0
         self.book1.save()
         url = reverse("borrowing:borrowing-list")
-        data = {"book": self.book1.id, "expected_return_date": "2024-12-31"}
+        data = {"book": self.book1.id, "expected_return_date": str(RETURN_DATE)}
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         expected_error = {
             "book": ErrorDetail(string="Book one is out of stock", code="invalid")
         }
         self.assertEqual(response.data, expected_error)
+
+    def test_list_borrowings_newest_first_with_cursor(self):
+        url = reverse("borrowing:borrowing-list")
+        response = self.client.get(url, {"page_size": 1}, format="json")
+        self.assertEqual(
+            response.data["results"], [BorrowingSerializer(self.borrowing2).data]
+        )
+
+        response = self.client.get(response.data["next"], format="json")
+        self.assertEqual(
+            response.data["results"], [BorrowingSerializer(self.borrowing1).data]
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_bulk_borrow(self):
+        self.client.force_authenticate(user=self.regular_user)
+        self.book2.inventory = 1
+        self.book2.save()
+        expected_return_date = str(date.today() + timedelta(days=7))
+        url = reverse("borrowing:borrowing-bulk")
+        data = {
+            "items": [
+                {"book": self.book1.id, "expected_return_date": expected_return_date},
+                {"book": self.book2.id, "expected_return_date": expected_return_date},
+                {"book": self.book2.id, "expected_return_date": expected_return_date},
+                {"book": 999, "expected_return_date": expected_return_date},
+            ]
+        }
+        response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["borrowed", "borrowed", "failed", "failed"],
+        )
+        self.assertEqual(results[2]["error"], "Book two is out of stock")
+        self.assertEqual(results[3]["error"], "Book 999 does not exist")
+        borrowing = Borrowing.objects.get(id=results[0]["borrowing"]["id"])
+        self.assertEqual(borrowing.user, self.regular_user)
+        self.assertEqual(borrowing.book, self.book1)
+        self.book1.refresh_from_db()
+        self.book2.refresh_from_db()
+        self.assertEqual(self.book1.inventory, 4)
+        self.assertEqual(self.book2.inventory, 0)
+
+    def test_bulk_borrow_uses_a_constant_number_of_queries(self):
+        self.client.force_authenticate(user=self.regular_user)
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Stack book {number}",
+                author="Author",
+                cover="Soft",
+                inventory=2,
+                daily_fee=1.00,
+            )
+            for number in range(20)
+        )
+        expected_return_date = str(date.today() + timedelta(days=7))
+        url = reverse("borrowing:borrowing-bulk")
+        data = {
+            "items": [
+                {"book": book.id, "expected_return_date": expected_return_date}
+                for book in books
+            ]
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Savepoint, lock, inventory update, insert, book and user rollups.
+        self.assertLessEqual(len(queries), 7)
+        self.assertEqual(Borrowing.objects.count(), 22)
+        self.assertEqual(
+            Book.objects.filter(
+                id__in=[book.id for book in books], inventory=1
+            ).count(),
+            20,
+        )
+
+    def test_bulk_borrow_validates_items(self):
+        self.client.force_authenticate(user=self.regular_user)
+        url = reverse("borrowing:borrowing-bulk")
+        data = {
+            "items": [
+                {"book": self.book1.id, "expected_return_date": "2000-01-01"},
+            ]
+        }
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(url, {"items": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_return(self):
+        self.client.force_authenticate(user=self.regular_user)
+        other_borrowing = Borrowing.objects.create(
+            user=self.admin_user,
+            book=self.book1,
+            expected_return_date=RETURN_DATE,
+        )
+        url = reverse("borrowing:borrowing-bulk-return")
+        data = {
+            "borrowings": [
+                self.borrowing1.id,
+                self.borrowing2.id,
+                self.borrowing1.id,
+                other_borrowing.id,
+            ]
+        }
+        response = self.client.post(url, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            ["returned", "returned", "failed", "failed"],
+        )
+        self.borrowing1.refresh_from_db()
+        self.borrowing2.refresh_from_db()
+        other_borrowing.refresh_from_db()
+        self.assertIsNotNone(self.borrowing1.actual_return_date)
+        self.assertIsNotNone(self.borrowing2.actual_return_date)
+        self.assertIsNone(other_borrowing.actual_return_date)
+        self.book1.refresh_from_db()
+        self.book2.refresh_from_db()
+        self.assertEqual(self.book1.inventory, 6)
+        self.assertEqual(self.book2.inventory, 4)
+
+    def test_conditional_get_skips_serialization(self):
+        url = reverse("borrowing:borrowing-list")
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_conditional_get_reads_only_the_page(self):
+        url = reverse("borrowing:borrowing-list")
+        next_url = self.client.get(url, {"page_size": 1}).data["next"]
+        etag = self.client.get(next_url)["ETag"]
+
+        # The second page only holds borrowing1.
+        Borrowing.objects.return_book(self.borrowing2)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(next_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIn("LIMIT 2", queries[0]["sql"])
+
+        Borrowing.objects.return_book(self.borrowing1)
+        response = self.client.get(next_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_conditional_get_follows_book_changes(self):
+        url = reverse("borrowing:borrowing-detail", kwargs={"pk": self.borrowing1.pk})
+        etag = self.client.get(url)["ETag"]
+        self.book1.title = "Renamed book"
+        self.book1.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_conditional_get_follows_returns(self):
+        url = reverse("borrowing:borrowing-list")
+        etag = self.client.get(url)["ETag"]
+        Borrowing.objects.return_book(self.borrowing1)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_filter_borrowings_by_book_and_dates(self):
+        url = reverse("borrowing:borrowing-list")
+        response = self.client.get(url, {"book_id": self.book2.id})
+        self.assertEqual(
+            response.data["results"], [BorrowingSerializer(self.borrowing2).data]
+        )
+
+        today = str(date.today())
+        response = self.client.get(
+            url, {"borrowed_after": today, "borrowed_before": today}
+        )
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(url, {"borrowed_before": "2000-01-01"})
+        self.assertEqual(response.data["results"], [])
+
+        response = self.client.get(url, {"borrowed_after": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url, {"book_id": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("book_id", response.data)
+
+    def test_filter_overdue_borrowings(self):
+        Borrowing.objects.filter(pk=self.borrowing1.pk).update(
+            expected_return_date=date.today() - timedelta(days=1)
+        )
+        url = reverse("borrowing:borrowing-list")
+        response = self.client.get(url, {"is_overdue": "true"})
+        self.assertEqual(
+            [borrowing["id"] for borrowing in response.data["results"]],
+            [self.borrowing1.id],
+        )
+
+    def test_borrow_and_return_update_book_counters(self):
+        self.client.force_authenticate(user=self.regular_user)
+        expected_return_date = str(date.today() + timedelta(days=7))
+        response = self.client.post(
+            reverse("borrowing:borrowing-list"),
+            {"book": self.book1.id, "expected_return_date": expected_return_date},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.client.post(
+            reverse("borrowing:borrowing-bulk"),
+            {
+                "items": [
+                    {
+                        "book": self.book1.id,
+                        "expected_return_date": expected_return_date,
+                    },
+                    {
+                        "book": self.book2.id,
+                        "expected_return_date": expected_return_date,
+                    },
+                ]
+            },
+            format="json",
+        )
+        self.book1.refresh_from_db()
+        self.book2.refresh_from_db()
+        self.assertEqual(self.book1.active_borrowings, 2)
+        self.assertEqual(self.book1.total_borrowings, 2)
+        self.assertEqual(self.book1.last_borrow_date, date.today())
+        self.assertEqual(self.book2.active_borrowings, 1)
+
+        self.client.post(
+            reverse("borrowing:borrowing-return", args=[response.data["id"]])
+        )
+        self.book1.refresh_from_db()
+        self.assertEqual(self.book1.active_borrowings, 1)
+        self.assertEqual(self.book1.total_borrowings, 2)
+
+    def test_recount_book_borrowings_repairs_drifted_counters(self):
+        Book.objects.filter(pk=self.book2.pk).update(
+            active_borrowings=1, total_borrowings=1, last_borrow_date=date.today()
+        )
+        Borrowing.objects.filter(pk=self.borrowing1.pk).update(
+            actual_return_date=date.today()
+        )
+        out = StringIO()
+        call_command("recount_book_borrowings", chunk_size=1, stdout=out)
+
+        self.assertIn("Checked 2 books", out.getvalue())
+        self.assertIn("repaired 1", out.getvalue())
+        self.book1.refresh_from_db()
+        self.assertEqual(self.book1.active_borrowings, 0)
+        self.assertEqual(self.book1.total_borrowings, 1)
+        self.assertEqual(self.book1.last_borrow_date, self.borrowing1.borrow_date)
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowing.models import Borrowing
+
+EXPORT_URL = reverse("borrowing:borrowing-export")
+
+
+class BorrowingExportTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.admin_user = user_model.objects.create_superuser(
+            email="admin@admin.com", password="admin1234pass"
+        )
+        self.regular_user = user_model.objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        book = Book.objects.create(
+            title="Book, with a comma",
+            author="Author",
+            cover="Hard",
+            inventory=5,
+            daily_fee=1.50,
+        )
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=user,
+                book=book,
+                expected_return_date=date.today() + timedelta(days=7),
+            )
+            for user in (self.regular_user, self.admin_user, self.regular_user)
+        ]
+        self.borrowings[0].borrow_date = date.today() - timedelta(days=10)
+        self.borrowings[0].save()
+        self.client.force_authenticate(user=self.admin_user)
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_csv(self):
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual(
+            [int(row["id"]) for row in rows],
+            [borrowing.id for borrowing in self.borrowings],
+        )
+        self.assertEqual(rows[0]["book_title"], "Book, with a comma")
+        self.assertEqual(rows[0]["user_email"], "user@user.com")
+        self.assertEqual(rows[0]["actual_return_date"], "")
+
+    def test_export_jsonl_with_filters(self):
+        response = self.client.get(
+            EXPORT_URL,
+            {
+                "file_format": "jsonl",
+                "user_id": self.regular_user.id,
+                "borrowed_after": str(date.today() - timedelta(days=1)),
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.borrowings[2].id])
+        self.assertEqual(rows[0]["borrow_date"], str(date.today()))
+        self.assertIsNone(rows[0]["actual_return_date"])
+
+    def test_export_rejects_unknown_format(self):
+        response = self.client.get(EXPORT_URL, {"file_format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_is_staff_only(self):
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.get(EXPORT_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "borrowings.jsonl")
+            call_command(
+                "export_borrowings",
+                path,
+                file_format="jsonl",
+                user_id=self.regular_user.id,
+                chunk_size=1,
+                stderr=io.StringIO(),
+            )
+            with open(path, encoding="utf-8") as stream:
+                rows = [json.loads(line) for line in stream]
+
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [self.borrowings[0].id, self.borrowings[2].id],
+        )
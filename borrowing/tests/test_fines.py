@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from books.models import Book
+from borrowing.fines import accrue_fines
+from borrowing.models import Borrowing, Fine
+
+TODAY = date.today()
+
+
+class AccrueFinesTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        book = Book.objects.create(
+            title="Book", author="Author", cover="Hard", inventory=10, daily_fee=1.50
+        )
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=user, book=book, expected_return_date=TODAY + timedelta(days=7)
+            )
+            for _ in range(4)
+        ]
+        Borrowing.objects.filter(pk=self.borrowings[0].pk).update(
+            expected_return_date=TODAY - timedelta(days=3)
+        )
+        Borrowing.objects.filter(pk=self.borrowings[1].pk).update(
+            expected_return_date=TODAY - timedelta(days=1)
+        )
+        Borrowing.objects.filter(pk=self.borrowings[2].pk).update(
+            expected_return_date=TODAY - timedelta(days=5),
+            actual_return_date=TODAY - timedelta(days=2),
+        )
+
+    def test_accrue_fines_on_active_overdue_borrowings(self):
+        chunks = list(accrue_fines(TODAY, chunk_size=1))
+
+        self.assertEqual(
+            chunks, [(self.borrowings[0].pk, 1), (self.borrowings[1].pk, 1)]
+        )
+        fines = {fine.borrowing_id: fine for fine in Fine.objects.all()}
+        self.assertEqual(set(fines), {self.borrowings[0].pk, self.borrowings[1].pk})
+        self.assertEqual(fines[self.borrowings[0].pk].days_overdue, 3)
+        self.assertEqual(fines[self.borrowings[0].pk].amount, Decimal("4.50"))
+        self.assertEqual(fines[self.borrowings[1].pk].amount, Decimal("1.50"))
+
+    def test_rerun_refreshes_pending_fines_only(self):
+        list(accrue_fines(TODAY))
+        Fine.objects.filter(borrowing=self.borrowings[1]).update(
+            status=Fine.StatusChoices.PAID
+        )
+        list(accrue_fines(TODAY + timedelta(days=2)))
+
+        self.assertEqual(Fine.objects.count(), 2)
+        self.assertEqual(
+            Fine.objects.get(borrowing=self.borrowings[0]).amount, Decimal("7.50")
+        )
+        self.assertEqual(
+            Fine.objects.get(borrowing=self.borrowings[1]).amount, Decimal("1.50")
+        )
+
+    def test_command_resumes_after_id(self):
+        out = StringIO()
+        call_command(
+            "accrue_fines",
+            "--date",
+            str(TODAY),
+            after_id=self.borrowings[0].pk,
+            stdout=out,
+        )
+
+        self.assertIn("Accrued 1 fines", out.getvalue())
+        self.assertEqual(
+            list(Fine.objects.values_list("borrowing_id", flat=True)),
+            [self.borrowings[1].pk],
+        )
@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models import F, Sum
+from django.test import TestCase
+
+from books.models import Book
+from borrowing.generating import PASSWORD, generate_dataset
+from borrowing.models import BookDailyStats, Borrowing
+
+TODAY = date(2026, 1, 1)
+
+
+def dataset():
+    return (
+        list(
+            get_user_model()
+            .objects.order_by("id")
+            .values_list("email", "first_name", "last_name", "is_staff")
+        ),
+        list(
+            Book.objects.order_by("id").values_list(
+                "title", "author", "cover", "inventory", "daily_fee"
+            )
+        ),
+        list(
+            Borrowing.objects.order_by("id").values_list(
+                "user__email",
+                "book__title",
+                "borrow_date",
+                "expected_return_date",
+                "actual_return_date",
+            )
+        ),
+    )
+
+
+class GenerateDatasetTests(TestCase):
+    def generate(self, seed=1, **options):
+        return list(
+            generate_dataset(seed, 20, 30, 500, staff=2, today=TODAY, **options)
+        )
+
+    def clear(self):
+        for model in (Borrowing, Book, get_user_model()):
+            model.objects.all().delete()
+
+    def test_same_seed_same_rows(self):
+        self.generate()
+        first = dataset()
+
+        self.clear()
+        self.generate()
+        self.assertEqual(dataset(), first)
+        self.clear()
+        self.generate(seed=2)
+        self.assertNotEqual(dataset()[1], first[1])
+
+    def test_rows_and_distributions(self):
+        counts = {model: rows for model, rows, _ in self.generate(days=100)}
+
+        self.assertEqual(counts, {get_user_model(): 20, Book: 30, Borrowing: 500})
+        users = get_user_model().objects.all()
+        self.assertEqual(users.filter(is_staff=True).count(), 2)
+        self.assertTrue(users.first().check_password(PASSWORD))
+
+        borrowings = Borrowing.objects.all()
+        dates = set(borrowings.values_list("borrow_date", flat=True))
+        self.assertGreater(len(dates), 50)
+        self.assertGreaterEqual(min(dates), TODAY - timedelta(days=99))
+        self.assertLessEqual(max(dates), TODAY)
+        active = borrowings.filter(actual_return_date__isnull=True)
+        self.assertTrue(active.filter(borrow_date__lt=TODAY - timedelta(days=28)))
+        self.assertGreater(borrowings.count() - active.count(), 400)
+        self.assertFalse(
+            borrowings.filter(actual_return_date__lt=F("borrow_date")).exists()
+        )
+
+        # The first books are the popular ones.
+        popular = borrowings.filter(book__in=Book.objects.order_by("id")[:3])
+        self.assertGreater(popular.count(), borrowings.count() // 4)
+
+    def test_command_rebuilds_counters_and_rollups(self):
+        call_command(
+            "generate_dataset",
+            users=5,
+            books=5,
+            borrowings=50,
+            staff=1,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(
+            Book.objects.aggregate(total=Sum("total_borrowings"))["total"], 50
+        )
+        self.assertEqual(
+            BookDailyStats.objects.aggregate(total=Sum("borrows"))["total"], 50
+        )
+
+    def test_command_validation(self):
+        with self.assertRaises(CommandError):
+            call_command("generate_dataset", users=1, staff=2, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("generate_dataset", overdue=2, stdout=StringIO())
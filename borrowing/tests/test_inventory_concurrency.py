@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+
+from books.models import Book
+from borrowing.models import Borrowing
+
+THREADS = 8
+ATTEMPTS = 40
+INVENTORY = 10
+
+
+def run_in_thread(func, *args):
+    try:
+        return func(*args)
+    finally:
+        connection.close()
+
+
+class InventoryConcurrencyTests(TransactionTestCase):
+
+    def setUp(self):
+        self.book = Book.objects.create(
+            title="Popular book",
+            author="Author",
+            cover="Hard",
+            inventory=INVENTORY,
+            daily_fee=1.00,
+        )
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        self.expected_return_date = date.today() + timedelta(days=7)
+
+    def borrow(self, _):
+        return Borrowing.objects.borrow(
+            user=self.user,
+            book=self.book,
+            expected_return_date=self.expected_return_date,
+        )
+
+    def return_book(self, borrowing):
+        return Borrowing.objects.return_book(borrowing)
+
+    def test_concurrent_borrowing_never_oversells(self):
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(
+                pool.map(run_in_thread, [self.borrow] * ATTEMPTS, range(ATTEMPTS))
+            )
+
+        borrowings = [borrowing for borrowing in results if borrowing is not None]
+        self.book.refresh_from_db()
+        self.assertEqual(len(borrowings), INVENTORY)
+        self.assertEqual(Borrowing.objects.count(), INVENTORY)
+        self.assertEqual(self.book.inventory, 0)
+
+    def test_concurrent_double_return_is_counted_once(self):
+        borrowings = [self.borrow(None) for _ in range(INVENTORY)]
+        attempts = borrowings * 4
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(
+                pool.map(run_in_thread, [self.return_book] * len(attempts), attempts)
+            )
+
+        self.book.refresh_from_db()
+        self.assertEqual(results.count(True), INVENTORY)
+        self.assertEqual(self.book.inventory, INVENTORY)
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+
+    def test_interleaved_borrow_and_return_keeps_inventory_consistent(self):
+        borrowings = [self.borrow(None) for _ in range(INVENTORY // 2)]
+
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            borrowed = pool.map(
+                run_in_thread, [self.borrow] * ATTEMPTS, range(ATTEMPTS)
+            )
+            returned = pool.map(
+                run_in_thread, [self.return_book] * len(borrowings), borrowings
+            )
+            borrowed, returned = list(borrowed), list(returned)
+
+        self.book.refresh_from_db()
+        active = Borrowing.objects.filter(actual_return_date__isnull=True).count()
+        self.assertTrue(all(returned))
+        self.assertGreaterEqual(self.book.inventory, 0)
+        self.assertEqual(self.book.inventory + active, INVENTORY)
+        self.assertEqual(self.book.active_borrowings, active)
+        self.assertEqual(self.book.total_borrowings, Borrowing.objects.count())
+
+    def test_recount_during_borrows_keeps_counters(self):
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            borrowed = pool.map(
+                run_in_thread, [self.borrow] * INVENTORY, range(INVENTORY)
+            )
+            recounted = pool.map(
+                run_in_thread,
+                [Borrowing.objects.recount_books] * INVENTORY,
+                [[self.book.pk]] * INVENTORY,
+            )
+            list(borrowed), list(recounted)
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 0)
+        self.assertEqual(self.book.active_borrowings, INVENTORY)
+        self.assertEqual(self.book.total_borrowings, INVENTORY)
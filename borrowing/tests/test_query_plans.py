@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowing.models import Borrowing
+
+BORROWINGS = 5000
+
+
+class BorrowingQueryPlanTests(TestCase):
+    """Check that the borrowing list filters are planned on an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.staff = user_model.objects.create_user(
+            email="staff@staff.com", password="staff1234pass", is_staff=True
+        )
+        users = user_model.objects.bulk_create(
+            user_model(email=f"user{number}@user.com") for number in range(50)
+        )
+        books = Book.objects.bulk_create(
+            Book(
+                title=f"Book {number}",
+                author="Author",
+                cover="Soft",
+                inventory=10,
+                daily_fee=1.00,
+            )
+            for number in range(100)
+        )
+        today = date.today()
+        borrowings = Borrowing.objects.bulk_create(
+            Borrowing(
+                user=users[number % len(users)],
+                book=books[number % len(books)],
+                expected_return_date=today + timedelta(days=number % 30 - 15),
+                actual_return_date=None if number % 10 == 0 else today,
+            )
+            for number in range(BORROWINGS)
+        )
+        for number, borrowing in enumerate(borrowings):
+            borrowing.borrow_date = today - timedelta(days=number % 365)
+        Borrowing.objects.bulk_update(borrowings, ["borrow_date"])
+        cls.user = users[0]
+        cls.book = books[0]
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def get_plan(self, user, **params):
+        """Explain the query the list endpoint runs for its page of rows."""
+        client = APIClient()
+        client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("borrowing:borrowing-list"), params)
+        self.assertEqual(response.status_code, 200)
+        # The last one, after the query for the conditional GET validators.
+        sql = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "borrowing_borrowing"."id"')
+        ][-1]
+        self.assertIn("LIMIT", sql)
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+            return "\n".join(str(row) for row in cursor.fetchall())
+
+    def assertUsesIndex(self, plan, index):
+        self.assertIn(index, plan)
+
+    def test_own_borrowings_use_user_index(self):
+        plan = self.get_plan(self.user)
+        self.assertUsesIndex(plan, "borrowing_user_date_idx")
+
+    def test_user_and_date_range_use_user_index(self):
+        plan = self.get_plan(
+            self.staff,
+            user_id=self.user.id,
+            borrowed_after=str(date.today() - timedelta(days=30)),
+        )
+        self.assertUsesIndex(plan, "borrowing_user_date_idx")
+
+    def test_book_filter_uses_book_index(self):
+        plan = self.get_plan(self.staff, book_id=self.book.id, is_active="true")
+        self.assertUsesIndex(plan, "borrowing_book_return_idx")
+
+    def test_overdue_filter_uses_partial_index(self):
+        plan = self.get_plan(self.staff, is_overdue="true")
+        self.assertUsesIndex(plan, "borrowing_active_idx")
+
+    def test_active_filter_uses_partial_index(self):
+        plan = self.get_plan(self.staff, is_active="true")
+        self.assertUsesIndex(plan, "borrowing_active_idx")
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from books.serializers import BookSerializer
+from borrowing.models import Borrowing
+from user.serializers import UserSerializer
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+ASYNC_BORROWING_URL = reverse("borrowing-async:borrowing-list")
+
+
+def select_sql(queries):
+    # The last one, after the query for the conditional GET validators.
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith('SELECT "borrowing_borrowing"."id"')
+    ][-1]
+
+
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@admin.com", password="admin1234pass"
+        )
+        self.book = Book.objects.create(
+            title="Book one", author="Author", cover="Hard", inventory=5, daily_fee=1
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_relations_are_ids_by_default(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(BORROWING_URL)
+
+        result = response.data["results"][0]
+        self.assertEqual(result["user"], self.user.id)
+        self.assertEqual(result["book"], self.book.id)
+        self.assertNotIn("JOIN", select_sql(queries.captured_queries))
+
+    def test_expand_nests_relations(self):
+        response = self.client.get(BORROWING_URL, {"expand": "user,book"})
+
+        result = response.data["results"][0]
+        self.assertEqual(result["user"], UserSerializer(self.user).data)
+        self.assertEqual(result["book"], BookSerializer(self.book).data)
+
+    def test_fields_trim_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                BORROWING_URL, {"fields": "id,book,is_active", "expand": "book"}
+            )
+
+        result = response.data["results"][0]
+        self.assertEqual(list(result), ["id", "book", "is_active"])
+        self.assertEqual(result["book"]["title"], "Book one")
+        sql = select_sql(queries.captured_queries)
+        self.assertIn('"books_book"."title"', sql)
+        self.assertIn('"actual_return_date"', sql)
+        self.assertNotIn('"expected_return_date"', sql)
+        self.assertNotIn("user_user", sql)
+
+    def test_detail_takes_fields(self):
+        url = reverse("borrowing:borrowing-detail", args=[self.borrowing.id])
+        response = self.client.get(url, {"fields": "id,user", "expand": "user"})
+
+        self.assertEqual(
+            response.data,
+            {"id": self.borrowing.id, "user": UserSerializer(self.user).data},
+        )
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(BORROWING_URL, {"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(BORROWING_URL, {"expand": "borrow_date"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_async_list_takes_fields(self):
+        response = self.client.get(
+            ASYNC_BORROWING_URL,
+            {"fields": "id,book", "expand": "book"},
+            headers={"Authorization": f"Authorize {AccessToken.for_user(self.user)}"},
+        )
+
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": self.borrowing.id, "book": BookSerializer(self.book).data}],
+        )
@@ -0,0 +1,151 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowing.models import BookDailyStats, Borrowing, UserDailyStats
+
+STATS_URL = reverse("borrowing:borrowing-stats")
+
+
+def snapshot(model):
+    return sorted(
+        model.objects.values_list(
+            "date", f"{model.key_field}_id", "borrows", "returns", "revenue"
+        )
+    )
+
+
+class BorrowingStatsTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.admin_user = user_model.objects.create_superuser(
+            email="admin@admin.com", password="admin1234pass"
+        )
+        self.regular_user = user_model.objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        self.book1 = Book.objects.create(
+            title="Book one", author="Author", cover="Hard", inventory=5, daily_fee=1.50
+        )
+        self.book2 = Book.objects.create(
+            title="Book two", author="Author", cover="Soft", inventory=5, daily_fee=2.00
+        )
+        self.expected_return_date = date.today() + timedelta(days=7)
+
+        self.borrowing = Borrowing.objects.borrow(
+            self.regular_user, self.book1, self.expected_return_date
+        )
+        Borrowing.objects.bulk_borrow(
+            self.admin_user,
+            [
+                {
+                    "book": self.book1.id,
+                    "expected_return_date": self.expected_return_date,
+                },
+                {
+                    "book": self.book2.id,
+                    "expected_return_date": self.expected_return_date,
+                },
+            ],
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_borrow_and_return_maintain_rollups(self):
+        Borrowing.objects.filter(pk=self.borrowing.pk).update(
+            borrow_date=date.today() - timedelta(days=3)
+        )
+        self.borrowing.refresh_from_db()
+        Borrowing.objects.return_book(self.borrowing)
+        other = Borrowing.objects.get(user=self.admin_user, book=self.book2)
+        Borrowing.objects.bulk_return(self.admin_user, [other.id])
+
+        today = date.today()
+        self.assertEqual(
+            snapshot(BookDailyStats),
+            [
+                (today, self.book1.id, 2, 1, 4.5),
+                (today, self.book2.id, 1, 1, 2),
+            ],
+        )
+        self.assertEqual(
+            snapshot(UserDailyStats),
+            [
+                (today, self.admin_user.id, 2, 1, 2),
+                (today, self.regular_user.id, 1, 1, 4.5),
+            ],
+        )
+
+    def test_rebuild_matches_incremental_rollups(self):
+        Borrowing.objects.return_book(self.borrowing)
+        expected = snapshot(BookDailyStats), snapshot(UserDailyStats)
+        BookDailyStats.objects.all().delete()
+        UserDailyStats.objects.update(borrows=100)
+
+        call_command("rebuild_borrowing_stats", window_days=1, stdout=StringIO())
+
+        self.assertEqual((snapshot(BookDailyStats), snapshot(UserDailyStats)), expected)
+
+    def test_stats_per_day(self):
+        Borrowing.objects.return_book(self.borrowing)
+        response = self.client.get(STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["start"], date.today() - timedelta(days=29))
+        self.assertEqual(
+            response.data["totals"],
+            {"borrows": 3, "returns": 1, "revenue": "1.50"},
+        )
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "date": str(date.today()),
+                    "borrows": 3,
+                    "returns": 1,
+                    "revenue": "1.50",
+                }
+            ],
+        )
+
+    def test_stats_per_book_and_user(self):
+        response = self.client.get(STATS_URL, {"group_by": "book"})
+        self.assertEqual(
+            [(row["book"], row["borrows"]) for row in response.data["results"]],
+            [(self.book1.id, 2), (self.book2.id, 1)],
+        )
+
+        response = self.client.get(
+            STATS_URL, {"group_by": "user", "user_id": self.regular_user.id}
+        )
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "user": self.regular_user.id,
+                    "borrows": 1,
+                    "returns": 0,
+                    "revenue": "0.00",
+                }
+            ],
+        )
+
+    def test_stats_validation(self):
+        response = self.client.get(
+            STATS_URL, {"group_by": "book", "user_id": self.regular_user.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(
+            STATS_URL, {"start": "2024-02-01", "end": "2024-01-01"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stats_are_staff_only(self):
+        self.client.force_authenticate(user=self.regular_user)
+        response = self.client.get(STATS_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
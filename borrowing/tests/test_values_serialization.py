@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from books.views import BookViewSet
+from borrowing.models import Borrowing
+from borrowing.views import BorrowingViewSet
+
+BOOK_URL = reverse("books:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+BORROWING_QUERIES = (
+    {},
+    {"expand": "user"},
+    {"expand": "user,book"},
+    {"fields": "id,is_active"},
+    {"fields": "book,actual_return_date", "expand": "book"},
+    {"is_active": "false", "page_size": 2},
+)
+BOOK_QUERIES = (
+    {},
+    {"fields": "daily_fee,last_borrow_date,cover"},
+    {"q": "Příliš"},
+    {"title": "Book", "page_size": 1},
+)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+)
+class ValuesSerializationTests(APITestCase):
+    """The values() read path must render the same bytes as the serializers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.admin_user = user_model.objects.create_superuser(
+            email="admin@admin.com", password="admin1234pass"
+        )
+        reader = user_model.objects.create_user(
+            email="reader@example.com", password="reader1234pass"
+        )
+        books = [
+            Book.objects.create(
+                title="Příliš žluťoučký kůň",
+                author="Anonym",
+                cover="Soft",
+                inventory=3,
+                daily_fee="0.99",
+            ),
+            Book.objects.create(
+                title="Book two",
+                author="Author",
+                cover="Hard",
+                inventory=0,
+                daily_fee=2,
+            ),
+            Book.objects.create(
+                title="Book three",
+                author="Author",
+                cover="Hard",
+                inventory=10,
+                daily_fee="999.50",
+            ),
+        ]
+        today = date.today()
+        for number, book in enumerate(books * 2):
+            borrowing = Borrowing.objects.borrow(
+                reader if number % 2 else cls.admin_user,
+                book,
+                today + timedelta(days=number + 1),
+            )
+            if number % 3 == 0:
+                Borrowing.objects.return_book(borrowing)
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.admin_user)
+
+    def assertSameContent(self, view, url, params):
+        with patch.object(view, "values_serialization", False):
+            expected = self.client.get(url, params)
+        response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+        return response
+
+    def test_borrowing_list(self):
+        for params in BORROWING_QUERIES:
+            with self.subTest(params=params):
+                response = self.assertSameContent(
+                    BorrowingViewSet, BORROWING_URL, params
+                )
+                self.assertTrue(response.data["results"])
+
+    def test_borrowing_next_page(self):
+        response = self.client.get(BORROWING_URL, {"page_size": 2})
+        self.assertSameContent(BorrowingViewSet, response.data["next"], {})
+
+    def test_borrowing_detail(self):
+        borrowing = Borrowing.objects.filter(actual_return_date__isnull=False).first()
+        url = reverse("borrowing:borrowing-detail", args=[borrowing.id])
+        for params in BORROWING_QUERIES[:5]:
+            with self.subTest(params=params):
+                self.assertSameContent(BorrowingViewSet, url, params)
+
+    def test_borrowing_detail_not_found(self):
+        url = reverse("borrowing:borrowing-detail", args=[0])
+        self.assertSameContent(BorrowingViewSet, url, {})
+
+    def test_book_list_and_detail(self):
+        for params in BOOK_QUERIES:
+            with self.subTest(params=params):
+                self.assertSameContent(BookViewSet, BOOK_URL, params)
+        url = reverse("books:book-detail", args=[Book.objects.first().id])
+        self.assertSameContent(BookViewSet, url, {})
+
+    def test_benchmark_checks_output(self):
+        out = StringIO()
+        call_command(
+            "benchmark_serialization", rows=10, repeat=1, expand=True, stdout=out
+        )
+        self.assertIn("borrowings (4 rows", out.getvalue())
@@ -0,0 +1,39 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.db import OperationalError
+from django.test import SimpleTestCase
+
+COMMAND = "borrowing.management.commands.wait_for_db"
+
+
+@patch(f"{COMMAND}.time.sleep")
+@patch(f"{COMMAND}.connections")
+class WaitForDbTests(SimpleTestCase):
+    def test_returns_once_database_answers(self, connections, sleep):
+        out = StringIO()
+        call_command("wait_for_db", stdout=out)
+
+        cursor = connections["default"].cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with("SELECT 1")
+        sleep.assert_not_called()
+        self.assertIn("Database available!", out.getvalue())
+
+    def test_backs_off_exponentially(self, connections, sleep):
+        cursor = connections["default"].cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = [OperationalError] * 4 + [None]
+
+        call_command("wait_for_db", max_delay=0.5, stdout=StringIO())
+
+        self.assertEqual(
+            [call.args[0] for call in sleep.call_args_list], [0.1, 0.2, 0.4, 0.5]
+        )
+
+    def test_gives_up_after_timeout(self, connections, sleep):
+        cursor = connections["default"].cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = OperationalError("refused")
+
+        with self.assertRaisesMessage(CommandError, "refused"):
+            call_command("wait_for_db", timeout=0, stdout=StringIO())
+        sleep.assert_not_called()
@@ -1,14 +1,46 @@
-from datetime import date
+from operator import itemgetter
 
+from django.http import Http404, StreamingHttpResponse
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from borrowing.models import Borrowing
-from borrowing.serializers import BorrowingSerializer, BorrowingCreateSerializer
+from borrowing.exporting import CONTENT_TYPES, FILE_FORMATS, export_borrowings
+from borrowing.filters import filter_borrowing_list
+from borrowing.models import ArchivedBorrowing, Borrowing
+from borrowing.pagination import BorrowingCursorPagination
+from borrowing.serializers import (
+    BorrowingSerializer,
+    BorrowingCreateSerializer,
+    BorrowingBulkCreateSerializer,
+    BorrowingBulkReturnSerializer,
+    BorrowingStatsQuerySerializer,
+    BorrowingStatsSerializer,
+)
+from borrowing.stats import query_stats
+from library_service_project.conditional import ConditionalGetMixin
+from library_service_project.fields import SparseFieldsViewMixin, ValuesPlan
+from library_service_project.replicas import ReplicaReadMixin
+from library_service_project.throttling import BorrowRateThrottle
+
+FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type={"type": "string"},
+        description="Only return these fields (ex. ?fields=id,book,is_active)",
+        required=False,
+    ),
+    OpenApiParameter(
+        "expand",
+        type={"type": "string"},
+        description="Nest these relations instead of their ids (ex. ?expand=book)",
+        required=False,
+    ),
+]
 
 
 @extend_schema_view(
@@ -26,52 +58,111 @@ from borrowing.serializers import BorrowingSerializer, BorrowingCreateSerializer
                 description="Filter by user id (ex. ?user_id=1)",
                 required=False,
             ),
+            OpenApiParameter(
+                "book_id",
+                type={"type": "string"},
+                description="Filter by book id (ex. ?book_id=1)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "borrowed_after",
+                type={"type": "string", "format": "date"},
+                description="Borrowed on or after (ex. ?borrowed_after=2024-01-31)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "borrowed_before",
+                type={"type": "string", "format": "date"},
+                description="Borrowed on or before (ex. ?borrowed_before=2024-12-31)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "is_overdue",
+                type={"type": "string"},
+                description="Only active borrowings past their return date "
+                "(ex. ?is_overdue=true)",
+                required=False,
+            ),
+            *FIELDS_PARAMETERS,
         ],
-        description="Retrieve a list of all borrowings",
+        description=(
+            "Retrieve a list of live borrowings. Borrowings moved to the "
+            "archive are only listed by /api/borrowing/history/ and the export."
+        ),
+    ),
+    retrieve=extend_schema(
+        parameters=FIELDS_PARAMETERS,
+        description="Retrieve a borrowing by id, archived borrowings included",
     ),
-    retrieve=extend_schema(description="Retrieve a borrowing by id"),
     create=extend_schema(description="Create a new borrowing"),
     update=extend_schema(description="Update an existing borrowing"),
     partial_update=extend_schema(description="Partially update an existing borrowing"),
     destroy=extend_schema(description="Delete a borrowing"),
 )
-class BorrowingViewSet(viewsets.ModelViewSet):
+class BorrowingViewSet(
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    SparseFieldsViewMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Borrowing.objects.all()
+    last_modified_fields = ("updated_at", "book__updated_at")
     permission_classes = (IsAuthenticated,)
+    pagination_class = BorrowingCursorPagination
+    values_serialization = True
+    sparse_fields_actions = ("list", "retrieve", "history")
+    replica_actions = ("list", "retrieve", "history")
+
+    def get_throttles(self):
+        if self.request.method in SAFE_METHODS:
+            return []
+        return [BorrowRateThrottle()]
 
     def get_serializer_class(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "history"]:
             return BorrowingSerializer
+        if self.action == "bulk_borrow":
+            return BorrowingBulkCreateSerializer
+        if self.action == "bulk_return":
+            return BorrowingBulkReturnSerializer
         return BorrowingCreateSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = Borrowing.objects.all().select_related("book", "user")
-
-        if user.is_staff:
-            user_id = self.request.query_params.get("user_id")
-            if user_id:
-                queryset = queryset.filter(user_id=user_id)
-        else:
-            queryset = queryset.filter(user=user)
+        return filter_borrowing_list(
+            Borrowing.objects.all().select_related("book", "user"),
+            self.request.user,
+            self.request.query_params,
+        )
 
-        is_active = self.request.query_params.get("is_active")
-        if is_active:
-            if is_active.lower() == "true":
-                queryset = queryset.filter(actual_return_date__isnull=True)
-            elif is_active.lower() == "false":
-                queryset = queryset.filter(actual_return_date__isnull=False)
+    def get_archived_queryset(self):
+        return filter_borrowing_list(
+            ArchivedBorrowing.objects.all(),
+            self.request.user,
+            self.request.query_params,
+        )
 
-        return queryset
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            # Archived borrowings can still be read, but no longer change.
+            plan = ValuesPlan(self.get_serializer())
+            row = get_object_or_404(
+                plan.values(self.get_archived_queryset()), pk=kwargs["pk"]
+            )
+            return Response(plan.serialize(row))
 
     def perform_create(self, serializer):
         book = serializer.validated_data["book"]
-        if book.inventory < 1:
+        borrowing = Borrowing.objects.borrow(
+            user=self.request.user,
+            book=book,
+            expected_return_date=serializer.validated_data["expected_return_date"],
+        )
+        if borrowing is None:
             raise ValidationError({"book": f"{book.title} is out of stock"})
-        book.inventory -= 1
-        book.save()
 
-        serializer.save(user=self.request.user)
+        serializer.instance = borrowing
 
     @extend_schema(
         responses={200: "Book returned successfully."},
@@ -81,19 +172,199 @@ class BorrowingViewSet(viewsets.ModelViewSet):
     def return_borrowing(self, request, pk=None):
         borrowing = self.get_object()
 
-        if not borrowing.is_active:
+        if not Borrowing.objects.return_book(borrowing):
             return Response(
                 {"error": "The book has already been returned"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        book = borrowing.book
-        book.inventory += 1
-        book.save()
+        return Response(
+            {"message": "Book returned successfully"}, status=status.HTTP_200_OK
+        )
+
+    @extend_schema(
+        description=(
+            "Borrow several books in one request. "
+            "Returns a result for every item in the request order."
+        ),
+    )
+    @action(detail=False, methods=["post"], url_path="bulk", url_name="bulk")
+    def bulk_borrow(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["items"]
+
+        results = Borrowing.objects.bulk_borrow(request.user, items)
 
-        borrowing.actual_return_date = date.today()
-        borrowing.save()
+        response = []
+        for item, result in zip(items, results):
+            if isinstance(result, Borrowing):
+                response.append(
+                    {
+                        "book": item["book"],
+                        "status": "borrowed",
+                        "borrowing": BorrowingCreateSerializer(result).data,
+                    }
+                )
+            else:
+                response.append(
+                    {"book": item["book"], "status": "failed", "error": result}
+                )
+        return Response({"results": response}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        description=(
+            "Return several borrowed books in one request. "
+            "Returns a result for every borrowing in the request order."
+        ),
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-return",
+        url_name="bulk-return",
+    )
+    def bulk_return(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        borrowing_ids = serializer.validated_data["borrowings"]
 
+        results = Borrowing.objects.bulk_return(request.user, borrowing_ids)
+
+        response = []
+        for borrowing_id, error in zip(borrowing_ids, results):
+            if error is None:
+                response.append({"borrowing": borrowing_id, "status": "returned"})
+            else:
+                response.append(
+                    {"borrowing": borrowing_id, "status": "failed", "error": error}
+                )
+        return Response({"results": response}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "after",
+                type={"type": "integer"},
+                description="Continue after this borrowing id (ex. ?after=120)",
+                required=False,
+            ),
+            *FIELDS_PARAMETERS,
+        ],
+        description=(
+            "Retrieve live and archived borrowings, newest first. "
+            "Accepts the same filters as the list."
+        ),
+    )
+    @action(detail=False, methods=["get"], url_path="history", url_name="history")
+    def history(self, request):
+        after = request.query_params.get("after")
+        if after:
+            try:
+                after = int(after)
+            except ValueError:
+                raise ValidationError({"after": "Enter a whole number."})
+
+        # Read a page from each table by id and merge them.
+        page_size = self.paginator.get_page_size(request)
+        plan = ValuesPlan(self.get_serializer())
+        rows = []
+        for queryset in (self.get_queryset(), self.get_archived_queryset()):
+            if after:
+                queryset = queryset.filter(pk__lt=after)
+            rows += plan.values(queryset.order_by("-pk"), "id")[: page_size + 1]
+        rows.sort(key=itemgetter("id"), reverse=True)
+
+        next_url = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            params = request.query_params.copy()
+            params["after"] = rows[-1]["id"]
+            next_url = request.build_absolute_uri(
+                f"{request.path}?{params.urlencode()}"
+            )
         return Response(
-            {"message": "Book returned successfully"}, status=status.HTTP_200_OK
+            {"next": next_url, "results": [plan.serialize(row) for row in rows]}
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "file_format",
+                type={"type": "string", "enum": list(FILE_FORMATS)},
+                description="Export format (ex. ?file_format=jsonl), csv by default",
+                required=False,
+            ),
+        ],
+        responses={200: {"type": "string", "format": "binary"}},
+        description=(
+            "Stream the borrowing history, archived borrowings included, "
+            "as CSV or JSONL. "
+            "Accepts the same filters as the list."
+        ),
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        url_name="export",
+        permission_classes=(IsAdminUser,),
+    )
+    def export(self, request):
+        # `format` is taken by DRF's format suffix override.
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in FILE_FORMATS:
+            raise ValidationError(
+                {"file_format": f"Choose one of: {', '.join(FILE_FORMATS)}."}
+            )
+
+        response = StreamingHttpResponse(
+            export_borrowings(
+                self.get_queryset(),
+                file_format,
+                archived=self.get_archived_queryset(),
+            ),
+            content_type=CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="borrowings.{file_format}"'
+        )
+        return response
+
+    @extend_schema(
+        parameters=[BorrowingStatsQuerySerializer],
+        description=(
+            "Borrows, returns and rental revenue between two dates "
+            "(the last 30 days by default), per day, book or user"
+        ),
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="stats",
+        url_name="stats",
+        permission_classes=(IsAdminUser,),
+    )
+    def stats(self, request):
+        query = BorrowingStatsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        totals, rows = query_stats(
+            params["start"],
+            params["end"],
+            group_by=params["group_by"],
+            book_id=params.get("book_id"),
+            user_id=params.get("user_id"),
+            limit=params["limit"],
+        )
+        return Response(
+            {
+                "start": params["start"],
+                "end": params["end"],
+                "group_by": params["group_by"],
+                "totals": BorrowingStatsSerializer(totals).data,
+                "results": BorrowingStatsSerializer(rows, many=True).data,
+            },
+            status=status.HTTP_200_OK,
         )
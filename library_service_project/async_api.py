@@ -0,0 +1,110 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.shortcuts import aget_object_or_404
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    NotAuthenticated,
+    Throttled,
+    ValidationError,
+)
+
+from user.authentication import CachedJWTAuthentication
+
+
+def async_api_view(view):
+    """
+    Turn the DRF exceptions and Http404 raised by an async view into the JSON
+    error responses the DRF views return.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail
+            if not isinstance(detail, (list, dict)):
+                detail = {"detail": detail}
+            response = JsonResponse(detail, status=exc.status_code, safe=False)
+            if getattr(exc, "wait", None):
+                response["Retry-After"] = str(exc.wait)
+            return response
+        except Http404:
+            return JsonResponse(
+                {"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+    return wrapper
+
+
+async def authenticate(request):
+    """Return the user of the request's JWT or raise NotAuthenticated."""
+    result = await CachedJWTAuthentication().aauthenticate(request)
+    if result is None:
+        raise NotAuthenticated()
+    return result[0]
+
+
+async def check_throttle(request, throttle):
+    """
+    Raise Throttled when `throttle` refuses the request. The async views
+    have no DRF user, so requests are counted per client address.
+    """
+    # The cache's async incr() is a get() and a set(), not atomic.
+    if not await sync_to_async(throttle.allow_key)(throttle.get_ident_key(request)):
+        raise Throttled(throttle.wait())
+
+
+def get_page_size(request):
+    try:
+        page_size = int(request.GET["page_size"])
+    except (KeyError, ValueError):
+        return settings.API_PAGE_SIZE
+    if page_size < 1:
+        return settings.API_PAGE_SIZE
+    return min(page_size, settings.API_MAX_PAGE_SIZE)
+
+
+async def serialize_object(request, queryset, serializer_class, **lookup):
+    """Serialize the object matching `lookup` with the request's fieldset."""
+    options = serializer_class.get_query_options(request.GET)
+    queryset = serializer_class(**options).trim_queryset(queryset)
+    obj = await aget_object_or_404(queryset, **lookup)
+    return serializer_class(obj, **options).data
+
+
+async def keyset_page(request, queryset, serializer_class, descending=False):
+    """
+    Serialize one page of the queryset in primary key order, starting after
+    the id in the `after` query parameter. `next` links to the following page.
+    `fields` and `expand` are passed on to the serializer.
+    """
+    page_size = get_page_size(request)
+    options = serializer_class.get_query_options(request.GET)
+    queryset = serializer_class(**options).trim_queryset(queryset)
+    after = request.GET.get("after")
+    if after:
+        try:
+            after = int(after)
+        except ValueError:
+            raise ValidationError({"after": "Enter a whole number."})
+        queryset = queryset.filter(**{"pk__lt" if descending else "pk__gt": after})
+
+    queryset = queryset.order_by("-pk" if descending else "pk")
+    objects = [obj async for obj in queryset[: page_size + 1]]
+
+    next_url = None
+    if len(objects) > page_size:
+        objects = objects[:page_size]
+        params = request.GET.copy()
+        params["after"] = objects[-1].pk
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+    return {
+        "next": next_url,
+        "results": serializer_class(objects, many=True, **options).data,
+    }
@@ -0,0 +1,275 @@
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from borrowing.generating import BORROWING_FIELDS, insert_rows
+from borrowing.models import Borrowing
+
+PASSWORD = "bench1234pass"
+DAY = date(2024, 1, 1)
+
+
+class Scenario:
+    """
+    One endpoint call. `prepare` gets the Benchmark and returns the keyword
+    arguments of Client.generic() for the next call; work it does is not
+    timed. The budgets hold for every dataset size.
+    """
+
+    def __init__(self, name, max_queries, max_ms, prepare):
+        self.name = name
+        self.max_queries = max_queries
+        self.max_ms = max_ms
+        self.prepare = prepare
+
+
+def _get(path, token=None):
+    headers = {"Authorization": f"Authorize {token}"} if token else {}
+    return {"method": "GET", "path": path, "headers": headers}
+
+
+def _post(path, data, token=None):
+    return {
+        **_get(path, token),
+        "method": "POST",
+        "data": json.dumps(data),
+        "content_type": "application/json",
+    }
+
+
+def _borrowing_return(benchmark):
+    borrowing = Borrowing.objects.create(
+        user=benchmark.reader,
+        book=benchmark.book,
+        expected_return_date=date.today() + timedelta(days=7),
+    )
+    return _post(
+        reverse("borrowing:borrowing-return", args=[borrowing.id]),
+        {},
+        benchmark.reader_token,
+    )
+
+
+SCENARIOS = (
+    Scenario(
+        "token_obtain",
+        1,
+        1000,
+        lambda benchmark: _post(
+            reverse("user:token_obtain_pair"),
+            {"email": benchmark.reader.email, "password": PASSWORD},
+        ),
+    ),
+    Scenario(
+        "user_me",
+        1,
+        50,
+        lambda benchmark: _get(reverse("user:manage"), benchmark.reader_token),
+    ),
+    Scenario(
+        "book_list",
+        2,
+        100,
+        lambda benchmark: _get(reverse("books:book-list")),
+    ),
+    Scenario(
+        "book_search",
+        2,
+        250,
+        lambda benchmark: _get(f"{reverse('books:book-list')}?q=Author+1"),
+    ),
+    Scenario(
+        "book_detail",
+        2,
+        50,
+        lambda benchmark: _get(reverse("books:book-detail", args=[benchmark.book.id])),
+    ),
+    Scenario(
+        "borrowing_list",
+        3,
+        100,
+        lambda benchmark: _get(
+            reverse("borrowing:borrowing-list"), benchmark.reader_token
+        ),
+    ),
+    Scenario(
+        "borrowing_list_expanded",
+        3,
+        250,
+        lambda benchmark: _get(
+            f"{reverse('borrowing:borrowing-list')}?expand=user,book",
+            benchmark.admin_token,
+        ),
+    ),
+    Scenario(
+        "borrowing_create",
+        8,
+        100,
+        lambda benchmark: _post(
+            reverse("borrowing:borrowing-list"),
+            {
+                "book": benchmark.book.id,
+                "expected_return_date": str(date.today() + timedelta(days=7)),
+            },
+            benchmark.reader_token,
+        ),
+    ),
+    Scenario("borrowing_return", 8, 100, _borrowing_return),
+)
+
+
+def _user_count(books):
+    return max(books // 10, 1)
+
+
+def seed(start, books):
+    """
+    Grow the dataset from `start` to `books` books, with a user per ten
+    books and two borrowings per book, one of them returned. Rows are bulk
+    inserted, so inventory, counters and rollups are not kept in step.
+    """
+    user_model = get_user_model()
+    password = make_password(PASSWORD)
+    Book.objects.bulk_create(
+        Book(
+            title=f"Book {number}",
+            author=f"Author {number % 100}",
+            cover="Hard" if number % 2 else "Soft",
+            inventory=number % 10,
+            daily_fee=f"{1 + number % 400 / 100:.2f}",
+        )
+        for number in range(start, books)
+    )
+    user_model.objects.bulk_create(
+        user_model(email=f"bench{number}@example.com", password=password)
+        for number in range(_user_count(start) if start else 0, _user_count(books))
+    )
+
+    book_ids = list(
+        Book.objects.filter(title__startswith="Book ")
+        .order_by("id")
+        .values_list("id", flat=True)[start:]
+    )
+    user_ids = list(
+        user_model.objects.filter(email__startswith="bench")
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    now = timezone.now()
+
+    def borrowings():
+        for number, book_id in enumerate(book_ids, start):
+            borrow_date = DAY + timedelta(days=number % 180)
+            expected = borrow_date + timedelta(days=14)
+            for offset, returned in (
+                (0, borrow_date + timedelta(days=number % 20)),
+                (1, None),
+            ):
+                user_id = user_ids[(number + offset) % len(user_ids)]
+                yield user_id, book_id, borrow_date, expected, returned, now
+
+    # insert_rows() keeps borrow_date, which bulk_create() would set to today.
+    insert_rows(Borrowing, BORROWING_FIELDS, borrowings())
+
+
+class Benchmark:
+    """Run the scenarios against datasets of growing size."""
+
+    def __init__(self, scenarios=SCENARIOS, repeat=20):
+        self.scenarios = scenarios
+        self.repeat = repeat
+        self.client = Client()
+
+    def setup(self):
+        user_model = get_user_model()
+        self.reader = user_model.objects.create_user(
+            email="reader@example.com", password=PASSWORD
+        )
+        self.admin = user_model.objects.create_superuser(
+            email="admin@example.com", password=PASSWORD
+        )
+        self.reader_token = str(AccessToken.for_user(self.reader))
+        self.admin_token = str(AccessToken.for_user(self.admin))
+        self.book = Book.objects.create(
+            title="Benchmark",
+            author="Author",
+            cover="Hard",
+            inventory=10**6,
+            daily_fee=1,
+        )
+
+    def run(self, sizes):
+        """Yield a result dict per scenario and dataset size."""
+        self.setup()
+        seeded = 0
+        for size in sizes:
+            seed(seeded, size)
+            seeded = size
+            for scenario in self.scenarios:
+                yield self.measure(scenario, size)
+
+    def measure(self, scenario, size):
+        timings = []
+        queries = 0
+        statuses = set()
+        for _ in range(self.repeat):
+            request = scenario.prepare(self)
+            # Every call is measured with cold caches.
+            for alias in settings.CACHES:
+                caches[alias].clear()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = self.client.generic(**request)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = max(queries, len(captured))
+            statuses.add(response.status_code)
+
+        p50 = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[18] if len(timings) > 1 else p50
+        return {
+            "scenario": scenario.name,
+            "size": size,
+            "status": sorted(statuses),
+            "queries": queries,
+            "max_queries": scenario.max_queries,
+            "p50_ms": round(p50, 3),
+            "p95_ms": round(p95, 3),
+            "max_ms": scenario.max_ms,
+        }
+
+
+def budget_failures(results, latency_factor=1.0):
+    """
+    Describe every result over its budget or with an error status. Latency
+    budgets are scaled by `latency_factor` and skipped when it is None.
+    """
+    failures = []
+    for result in results:
+        name = f"{result['scenario']} at {result['size']}"
+        if any(status >= 400 for status in result["status"]):
+            failures.append(f"{name}: status {result['status']}")
+        if result["queries"] > result["max_queries"]:
+            failures.append(
+                f"{name}: {result['queries']} queries, "
+                f"budget {result['max_queries']}"
+            )
+        if latency_factor is not None:
+            budget = result["max_ms"] * latency_factor
+            if result["p50_ms"] > budget:
+                failures.append(
+                    f"{name}: p50 {result['p50_ms']:.1f}ms, budget {budget:.0f}ms"
+                )
+    return failures
@@ -0,0 +1,116 @@
+import hashlib
+from calendar import timegm
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.pagination import CursorPagination
+
+
+def page_queryset(paginator, queryset, request, view):
+    """
+    Narrow the queryset to the rows CursorPagination.paginate_queryset()
+    would fetch for this request: the page and the row after it, which
+    decides the `next` link.
+    """
+    page_size = paginator.get_page_size(request)
+    if not isinstance(paginator, CursorPagination) or not page_size:
+        return queryset
+
+    ordering = paginator.get_ordering(request, queryset, view)
+    cursor = paginator.decode_cursor(request)
+    offset, reverse, position = cursor or (0, False, None)
+    if reverse:
+        queryset = queryset.order_by(
+            *(field[1:] if field[0] == "-" else f"-{field}" for field in ordering)
+        )
+    else:
+        queryset = queryset.order_by(*ordering)
+    if position is not None:
+        order = ordering[0]
+        lookup = "lt" if reverse != order.startswith("-") else "gt"
+        queryset = queryset.filter(**{f"{order.lstrip('-')}__{lookup}": position})
+    return queryset[offset : offset + page_size + 1]
+
+
+class ConditionalGetMixin:
+    """
+    Answer If-None-Match on list and retrieve, and If-Modified-Since on
+    retrieve, with 304 Not Modified. The validators come from one query for
+    the ids and `last_modified_fields` of the requested object or page, so an
+    unchanged resource is never loaded or serialized.
+    """
+
+    last_modified_fields = ("updated_at",)
+
+    def get_validator_state(self, request):
+        """
+        Return (digest of the served rows, last modified datetime), or None
+        if the requested object doesn't exist. Lists have no last modified
+        time: deleting a row or rows moving between pages doesn't advance it.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            "pk", *self.last_modified_fields
+        )
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        detail = lookup_url_kwarg in self.kwargs
+        if detail:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        elif self.paginator is not None:
+            queryset = page_queryset(self.paginator, queryset, request, self)
+
+        rows = list(queryset)
+        if not rows and detail:
+            return None
+
+        last_modified = None
+        if detail:
+            last_modified = max(filter(None, rows[0][1:]), default=None)
+        return hashlib.md5(repr(rows).encode()).hexdigest(), last_modified
+
+    def get_validators(self, request):
+        """Return (etag, last modified timestamp) or None if nothing matches."""
+        state = self.get_validator_state(request)
+        if state is None:
+            return None
+
+        digest, last_modified = state
+        fingerprint = "|".join(
+            [
+                request.get_full_path(),
+                request.accepted_renderer.format,
+                str(request.user.pk),
+                digest,
+            ]
+        )
+        etag = '"%s"' % hashlib.md5(fingerprint.encode()).hexdigest()
+        timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+        return etag, timestamp
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        validators = self.get_validators(request)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,268 @@
+import datetime
+import decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+# Fields whose representation of a database value is the value itself.
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.ReadOnlyField,
+)
+
+
+def _split(value):
+    return [name for name in (part.strip() for part in value.split(",")) if name]
+
+
+def get_columns(serializer):
+    """
+    Return the model field paths the serializer reads, ready for `only()`.
+    Nested serializers contribute their own columns under their source.
+    """
+    field_columns = getattr(serializer, "field_columns", {})
+    columns = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in field_columns:
+            columns.extend(field_columns[name])
+        elif isinstance(field, serializers.BaseSerializer):
+            columns.extend(f"{field.source}__{column}" for column in get_columns(field))
+        else:
+            columns.append(field.source)
+    return columns
+
+
+def _decimal_converter(field):
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return "{:f}".format(
+            value.quantize(exponent, rounding=field.rounding, context=context)
+        )
+
+    return convert
+
+
+def get_converter(field):
+    """
+    Return a function turning a column value into the field's representation,
+    or None when the value already is its representation.
+    """
+    if isinstance(field, IDENTITY_FIELDS):
+        return None
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if output_format is None:
+            return None
+        if output_format.lower() == ISO_8601:
+            return datetime.date.isoformat
+    if (
+        isinstance(field, serializers.DecimalField)
+        and getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        and not field.localize
+        and field.decimal_places is not None
+    ):
+        return _decimal_converter(field)
+    return field.to_representation
+
+
+class ValuesPlan:
+    """
+    Serialize rows of a `values()` query the way a SparseFieldsMixin
+    serializer serializes model instances, without building the instances.
+    Converters are looked up once, and `field_expressions` compute fields
+    such as properties in SQL.
+    """
+
+    def __init__(self, serializer):
+        self.columns = []
+        self.expressions = {}
+        self.fields = self._compile(serializer, "")
+
+    def _compile(self, serializer, prefix):
+        expressions = getattr(serializer, "field_expressions", {})
+        if expressions and prefix:
+            raise ImproperlyConfigured(
+                f"{type(serializer).__name__} uses field_expressions, "
+                "which can't be nested."
+            )
+        fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == "*":
+                raise ImproperlyConfigured(
+                    f"Field {name!r} of {type(serializer).__name__} "
+                    "can't be read from values()."
+                )
+            key = prefix + "__".join(field.source_attrs)
+            if name in expressions:
+                self.expressions[key] = expressions[name]
+                fields.append((name, key, None, None))
+            elif isinstance(field, serializers.BaseSerializer):
+                pk_key = f"{key}__{field.Meta.model._meta.pk.name}"
+                self.columns.append(pk_key)
+                fields.append((name, pk_key, None, self._compile(field, f"{key}__")))
+            else:
+                self.columns.append(key)
+                fields.append((name, key, get_converter(field), None))
+        return fields
+
+    def values(self, queryset, *extra):
+        """Select the plan's columns, plus `extra` ones such as the ordering."""
+        columns = dict.fromkeys([*self.columns, *extra])
+        for name in self.expressions:
+            columns.pop(name, None)
+        return queryset.values(*columns, **self.expressions)
+
+    def serialize(self, row, fields=None):
+        data = {}
+        for name, key, convert, nested in fields or self.fields:
+            value = row[key]
+            if value is not None:
+                if nested is not None:
+                    value = self.serialize(row, nested)
+                elif convert is not None:
+                    value = convert(value)
+            data[name] = value
+        return data
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets and expandable relations.
+    `fields` limits the output to the named fields. Relations in
+    `expandable_fields` are serialized as primary keys unless named in
+    `expand`. `field_columns` maps fields that are not model fields to the
+    columns they read, and `field_expressions` to the SQL computing them for
+    ValuesPlan.
+    """
+
+    expandable_fields = {}
+    field_columns = {}
+    field_expressions = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        self.requested_fields = fields
+        self.expanded_fields = expand
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def get_query_options(cls, params):
+        """Read `fields` and `expand` from query parameters, checking names."""
+        options = {}
+        for name, allowed in (
+            ("fields", cls.Meta.fields),
+            ("expand", cls.expandable_fields),
+        ):
+            names = _split(params.get(name, ""))
+            if not names:
+                continue
+            unknown = [value for value in names if value not in allowed]
+            if unknown:
+                raise ValidationError(
+                    {name: f"Unknown field(s): {', '.join(unknown)}."}
+                )
+            options[name] = names
+        return options
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.expanded_fields:
+            fields[name] = self.expandable_fields[name](read_only=True)
+        if self.requested_fields is not None:
+            fields = {
+                name: field
+                for name, field in fields.items()
+                if name in self.requested_fields
+            }
+        return fields
+
+    def trim_queryset(self, queryset):
+        """Join the expanded relations and load only the columns serialized."""
+        queryset = queryset.select_related(None).only(*get_columns(self))
+        related = [name for name in self.expanded_fields if name in self.fields]
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
+
+
+class SparseFieldsViewMixin:
+    """
+    Let list and retrieve take `?fields=` and `?expand=`, passing them to a
+    SparseFieldsMixin serializer and trimming the queryset to match.
+    With `values_serialization` list and retrieve render `values()` rows
+    through a ValuesPlan instead; the JSON is the same.
+    """
+
+    sparse_fields_actions = ("list", "retrieve")
+    values_serialization = False
+
+    def get_sparse_options(self):
+        if self.action not in self.sparse_fields_actions:
+            return {}
+        if not hasattr(self, "_sparse_options"):
+            self._sparse_options = self.get_serializer_class().get_query_options(
+                self.request.query_params
+            )
+        return self._sparse_options
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.get_sparse_options())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.sparse_fields_actions:
+            serializer_class = self.get_serializer_class()
+            queryset = serializer_class(**self.get_sparse_options()).trim_queryset(
+                queryset
+            )
+        return queryset
+
+    def get_values_ordering(self, queryset):
+        """Return the columns the paginator reads from the page's rows."""
+        get_ordering = getattr(self.paginator, "get_ordering", None)
+        if get_ordering is None:
+            return ()
+        return [name.lstrip("-") for name in get_ordering(self.request, queryset, self)]
+
+    def list(self, request, *args, **kwargs):
+        if not self.values_serialization:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = ValuesPlan(self.get_serializer())
+        rows = plan.values(queryset, *self.get_values_ordering(queryset))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([plan.serialize(row) for row in page])
+        return Response([plan.serialize(row) for row in rows])
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.values_serialization:
+            return super().retrieve(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = ValuesPlan(self.get_serializer())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            plan.values(queryset),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, row)
+        return Response(plan.serialize(row))
@@ -0,0 +1,110 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+REQUESTS = Counter(
+    "http_requests",
+    "HTTP requests by view, method and status code.",
+    ["view", "method", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ["view", "method"],
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL queries run by one HTTP request.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time one HTTP request spent in SQL queries.",
+    ["view"],
+)
+
+
+_query_timer = ContextVar("query_timer", default=None)
+
+
+class QueryTimer:
+    """Count the SQL queries of one request and the time they take."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+@contextmanager
+def timed_queries():
+    """
+    Time the queries run in this context, including the ones async views
+    run in sync_to_async threads, which see a copy of the context.
+    """
+    timer = QueryTimer()
+    token = _query_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _query_timer.reset(token)
+
+
+def time_query(execute, sql, params, many, context):
+    """Database execute wrapper reporting to the timer of the context."""
+    timer = _query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.duration += time.perf_counter() - started
+        timer.count += 1
+
+
+def install_query_timer(connection, **kwargs):
+    # First in the list, so the wrappers of `connection.execute_wrapper()`
+    # blocks are still the ones they pop.
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, time_query)
+
+
+connection_created.connect(install_query_timer)
+
+
+def record_request(view, method, status, duration, timer):
+    if method not in METHODS:
+        method = "other"
+    REQUESTS.labels(view, method, status).inc()
+    REQUEST_DURATION.labels(view, method).observe(duration)
+    DB_QUERIES.labels(view).observe(timer.count)
+    DB_DURATION.labels(view).observe(timer.duration)
+
+
+def generate_metrics():
+    """
+    Return the metrics in the Prometheus text format. With
+    PROMETHEUS_MULTIPROC_DIR set the samples of every worker process are
+    summed up.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
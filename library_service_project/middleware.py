@@ -0,0 +1,58 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+
+from library_service_project.metrics import (
+    install_query_timer,
+    record_request,
+    timed_queries,
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record the count, latency, SQL queries and SQL time of every request per
+    view for /metrics and report them in a Server-Timing header. Streamed
+    responses are measured until the view returns them: the header goes out
+    before the body, so the time spent streaming it isn't included.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        # Connections opened before this middleware was loaded missed the
+        # connection_created signal.
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection)
+        started = time.perf_counter()
+        with timed_queries() as timer:
+            response = self.get_response(request)
+        return self.finish(request, response, timer, started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with timed_queries() as timer:
+            response = await self.get_response(request)
+        return self.finish(request, response, timer, started)
+
+    @staticmethod
+    def finish(request, response, timer, started):
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else "<unresolved>"
+        record_request(view, request.method, response.status_code, duration, timer)
+        response["Server-Timing"] = (
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries", '
+            f"total;dur={duration * 1000:.1f}"
+        )
+        return response
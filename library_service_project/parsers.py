@@ -0,0 +1,29 @@
+import msgpack
+import orjson
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from library_service_project.renderers import MessagePackRenderer, OrjsonRenderer
+
+
+class OrjsonParser(parsers.JSONParser):
+    """JSONParser reading the request body with orjson."""
+
+    renderer_class = OrjsonRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(parsers.BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except (TypeError, ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
@@ -0,0 +1,38 @@
+import msgpack
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+# DRF's encoder takes care of what the fast libraries leave out: Decimal,
+# lazy translations and the DRF formatting of dates, times and datetimes.
+default = JSONEncoder().default
+
+
+class OrjsonRenderer(renderers.JSONRenderer):
+    """JSONRenderer encoding through orjson."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        # Item-level list errors are keyed by index, e.g. {"borrowings": {0: [...]}}.
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        content = orjson.dumps(data, default=default, option=option)
+        # Like JSONRenderer, keep the output a strict javascript subset.
+        return content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=default, datetime=False)
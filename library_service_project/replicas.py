@@ -0,0 +1,84 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+# The replica the current request reads from, None for the primary.
+_replica = ContextVar("replica", default=None)
+
+
+def get_pin_cache():
+    return caches[settings.DATABASE_PIN_CACHE_ALIAS]
+
+
+def pin_to_primary(*names):
+    """
+    Read data behind these pins from the primary until the replicas catch
+    up, so readers see writes that were just made.
+    """
+    if settings.DATABASE_REPLICAS:
+        get_pin_cache().set_many(
+            {f"db:primary:{name}": True for name in names},
+            settings.DATABASE_PIN_SECONDS,
+        )
+
+
+def is_pinned(*names):
+    return bool(get_pin_cache().get_many([f"db:primary:{name}" for name in names]))
+
+
+class ReplicaRouter:
+    """
+    Send reads to the replica picked for the request by ReplicaReadMixin and
+    everything else to the primary. The first write of a request moves its
+    later reads back to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        _replica.set(None)
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+
+class ReplicaReadMixin:
+    """
+    Serve `replica_actions` from a random one of DATABASE_REPLICAS, unless
+    one of the request's pins was set within the last DATABASE_PIN_SECONDS.
+    Authentication, permissions and throttles still read from the primary.
+    A successful write sets the pins, so its user reads their own changes.
+    """
+
+    replica_actions = ("list", "retrieve")
+
+    def get_pins(self, request):
+        if request.user and request.user.is_authenticated:
+            return [f"user:{request.user.pk}"]
+        return []
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and self.action in self.replica_actions
+            and not is_pinned(*self.get_pins(request))
+        ):
+            self._replica_token = _replica.set(
+                random.choice(settings.DATABASE_REPLICAS)
+            )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            _replica.reset(token)
+            self._replica_token = None
+        elif request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(*self.get_pins(request))
+        return super().finalize_response(request, response, *args, **kwargs)
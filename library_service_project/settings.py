@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "library_service_project.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -86,6 +87,24 @@ WSGI_APPLICATION = "library_service_project.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# Connections are reused either through a psycopg pool per worker process
+# (DB_POOL=true) or as persistent connections kept for CONN_MAX_AGE seconds.
+# Keep workers * DB_POOL_MAX_SIZE below PostgreSQL's max_connections: by
+# default DB_MAX_CONNECTIONS is split between WEB_CONCURRENCY workers.
+# Prefer the pool under ASGI, where persistent connections aren't reused.
+DB_POOL = os.getenv("DB_POOL", "false").lower() == "true"
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 2))
+DB_POOL_MAX_SIZE = int(
+    os.getenv(
+        "DB_POOL_MAX_SIZE",
+        max(
+            DB_POOL_MIN_SIZE,
+            int(os.getenv("DB_MAX_CONNECTIONS", 80))
+            // int(os.getenv("WEB_CONCURRENCY", 8)),
+        ),
+    )
+)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -93,9 +112,73 @@ DATABASES = {
         "NAME": os.getenv("POSTGRES_DB"),
         "USER": os.getenv("POSTGRES_USER"),
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
+        # The pool keeps the connections itself, so it needs CONN_MAX_AGE=0.
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.getenv("CONN_HEALTH_CHECKS", "true").lower()
+        == "true",
+        "OPTIONS": {},
+    }
+}
+
+if DB_POOL:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": DB_POOL_MIN_SIZE,
+        "max_size": DB_POOL_MAX_SIZE,
+        # Seconds a request may wait for a free connection before failing.
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 600)),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", 3600)),
+        # Check connections as they leave the pool, like CONN_HEALTH_CHECKS.
+        "check": ConnectionPool.check_connection,
+    }
+
+# Read replicas of the primary, as comma separated POSTGRES_REPLICA_HOSTS
+# reached with the primary's credentials. Book and borrowing lists and
+# details are read from them, except for users who wrote within the last
+# DATABASE_PIN_SECONDS, which should cover the replication lag.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    alias = f"replica{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["library_service_project.replicas.ReplicaRouter"]
+DATABASE_PIN_SECONDS = int(os.getenv("DATABASE_PIN_SECONDS", 10))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
     }
 }
 
+BOOK_CACHE_ALIAS = "default"
+BOOK_CACHE_TIMEOUT = int(os.getenv("BOOK_CACHE_TIMEOUT", 300))
+
+USER_CACHE_ALIAS = "default"
+USER_CACHE_TIMEOUT = int(os.getenv("USER_CACHE_TIMEOUT", 60))
+
+# Throttle counters must be shared by all workers, so point this alias at
+# Redis or Memcached in production; LocMemCache counts per process.
+THROTTLE_CACHE_ALIAS = "default"
+
+DATABASE_PIN_CACHE_ALIAS = "default"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -142,11 +225,41 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "library_service_project.renderers.OrjsonRenderer",
+        "library_service_project.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "library_service_project.parsers.OrjsonParser",
+        "library_service_project.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.getenv("THROTTLE_LOGIN_RATE", "10/min"),
+        "register": os.getenv("THROTTLE_REGISTER_RATE", "20/hour"),
+        "borrow": os.getenv("THROTTLE_BORROW_RATE", "30/min"),
+        "catalogue": os.getenv("THROTTLE_CATALOGUE_RATE", "600/min"),
+    },
+    # Proxies in front of the app, so throttles see the client's address
+    # in X-Forwarded-For instead of the proxy's.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
 }
 
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 20))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 100))
+
+# `archive_borrowings` moves borrowings returned this many days ago out of
+# the live table.
+BORROWING_ARCHIVE_DAYS = int(os.getenv("BORROWING_ARCHIVE_DAYS", 365))
+
+# Bearer token Prometheus must send to scrape /metrics; open when unset.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
@@ -0,0 +1,39 @@
+from django.test import TestCase
+
+from library_service_project.benchmarks import Benchmark, budget_failures
+
+
+class QueryBudgetTests(TestCase):
+    """Run the API benchmark on small datasets to catch query regressions."""
+
+    def test_query_budgets_hold_as_data_grows(self):
+        results = list(Benchmark(repeat=2).run([5, 50]))
+
+        self.assertEqual(budget_failures(results, latency_factor=None), [])
+        queries = {}
+        for result in results:
+            queries.setdefault(result["scenario"], set()).add(result["queries"])
+        for scenario, counts in queries.items():
+            with self.subTest(scenario=scenario):
+                self.assertEqual(len(counts), 1)
+
+    def test_budget_failures(self):
+        result = {
+            "scenario": "book_list",
+            "size": 10,
+            "status": [200],
+            "queries": 3,
+            "max_queries": 2,
+            "p50_ms": 120.0,
+            "p95_ms": 150.0,
+            "max_ms": 100,
+        }
+
+        self.assertEqual(
+            budget_failures([result]),
+            [
+                "book_list at 10: 3 queries, budget 2",
+                "book_list at 10: p50 120.0ms, budget 100ms",
+            ],
+        )
+        self.assertEqual(len(budget_failures([result], latency_factor=2)), 1)
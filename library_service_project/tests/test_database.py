@@ -0,0 +1,59 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+DB_STATS_URL = reverse("db-stats")
+
+
+class FakePool:
+    def get_stats(self):
+        return {"pool_size": 4, "requests_num": 4, "requests_wait_ms": 10}
+
+
+class DatabaseStatsTests(APITestCase):
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_superuser(
+            email="admin@admin.com", password="admin1234pass"
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_stats_show_connection_settings(self):
+        response = self.client.get(DB_STATS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        default = response.data["default"]
+        self.assertEqual(default["vendor"], connection.vendor)
+        self.assertIn("conn_max_age", default)
+        self.assertIsNone(default["pool"])
+
+    def test_stats_report_average_pool_wait(self):
+        with patch.object(connection, "pool", FakePool(), create=True):
+            response = self.client.get(DB_STATS_URL)
+
+        pool = response.data["default"]["pool"]
+        self.assertEqual(pool["pool_size"], 4)
+        self.assertEqual(pool["requests_wait_avg_ms"], 2.5)
+
+    def test_stats_are_staff_only(self):
+        self.client.force_authenticate(
+            user=get_user_model().objects.create_user(
+                email="user@user.com", password="user1234pass"
+            )
+        )
+        response = self.client.get(DB_STATS_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class BenchmarkDatabaseConnectionsTests(TransactionTestCase):
+    def test_benchmark_db_connections(self):
+        out = StringIO()
+        call_command("benchmark_db_connections", queries=5, stdout=out)
+        self.assertIn("new connection per request", out.getvalue())
+        self.assertIn("persistent connection", out.getvalue())
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from django.db import OperationalError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from library_service_project import views
+
+HEALTHZ_URL = reverse("healthz")
+READYZ_URL = reverse("readyz")
+
+
+class HealthCheckTests(TestCase):
+    def setUp(self):
+        views._migrated_databases.clear()
+
+    def test_healthz_reports_database_latency(self):
+        response = self.client.get(HEALTHZ_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "ok")
+        self.assertGreaterEqual(response.json()["database"]["latency_ms"], 0)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_healthz_fails_without_database(self):
+        error = OperationalError('connection to "db:5432" as "library" refused')
+        with patch.object(views, "ping_database", side_effect=error):
+            with self.assertLogs(views.logger, "ERROR") as logs:
+                response = self.client.get(HEALTHZ_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            response.json(), {"status": "unavailable", "database": "unavailable"}
+        )
+        self.assertIn("db:5432", logs.output[0])
+
+    def test_readyz_checks_migrations_once(self):
+        response = self.client.get(READYZ_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()["database"]["migrations_applied"])
+        with patch.object(views, "MigrationExecutor") as executor:
+            self.client.get(READYZ_URL)
+        executor.assert_not_called()
+
+    def test_readyz_fails_with_pending_migrations(self):
+        with patch.object(views, "MigrationExecutor") as executor:
+            executor.return_value.migration_plan.return_value = [("migration", False)]
+            response = self.client.get(READYZ_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["status"], "migrating")
+        self.assertEqual(views._migrated_databases, set())
@@ -0,0 +1,90 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+METRICS_URL = reverse("metrics")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        cls.headers = {"Authorization": f"Authorize {AccessToken.for_user(user)}"}
+
+    def test_request_is_counted_and_timed(self):
+        requests = sample(
+            "http_requests_total",
+            view="borrowing:borrowing-list",
+            method="GET",
+            status="200",
+        )
+        queries = sample("http_request_db_queries_sum", view="borrowing:borrowing-list")
+
+        response = self.client.get(BORROWING_URL, headers=self.headers)
+
+        self.assertEqual(
+            sample(
+                "http_requests_total",
+                view="borrowing:borrowing-list",
+                method="GET",
+                status="200",
+            ),
+            requests + 1,
+        )
+        self.assertGreater(
+            sample("http_request_db_queries_sum", view="borrowing:borrowing-list"),
+            queries,
+        )
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="[1-9]\d* queries", total;dur=[\d.]+$',
+        )
+
+    async def test_async_view_queries_are_timed(self):
+        response = await self.async_client.get(
+            reverse("borrowing-async:borrowing-list"), headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"')
+
+    def test_metrics_endpoint(self):
+        self.client.get(BORROWING_URL, headers=self.headers)
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            b'http_request_duration_seconds_count{method="GET",view="borrowing:borrowing-list"}',
+            response.content,
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(
+            METRICS_URL, headers={"Authorization": "Bearer secret"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_metrics_from_multiprocess_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": directory}):
+                response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn(b"http_requests_total", response.content)
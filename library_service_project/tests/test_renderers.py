@@ -0,0 +1,118 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+import msgpack
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from library_service_project.parsers import MessagePackParser, OrjsonParser
+from library_service_project.renderers import MessagePackRenderer, OrjsonRenderer
+
+BOOK_URL = reverse("books:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return")
+
+PAYLOAD = {
+    "daily_fee": Decimal("1.50"),
+    "borrow_date": date(2024, 6, 1),
+    "created_at": datetime(2024, 6, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    "title": "Příliš žluťoučký kůň\u2028",
+    "detail": gettext_lazy("Not found."),
+    "items": [1, 2.5, None, True],
+}
+
+
+class RendererTests(SimpleTestCase):
+    def test_orjson_matches_json_renderer(self):
+        self.assertEqual(
+            OrjsonRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD)
+        )
+
+    def test_orjson_indents_on_request(self):
+        content = OrjsonRenderer().render(
+            {"id": 1}, accepted_media_type="application/json; indent=4"
+        )
+        self.assertEqual(content, b'{\n  "id": 1\n}')
+
+    def test_msgpack_encodes_like_json(self):
+        content = MessagePackRenderer().render(PAYLOAD)
+        self.assertEqual(
+            msgpack.unpackb(content),
+            OrjsonParser().parse(BytesIO(OrjsonRenderer().render(PAYLOAD))),
+        )
+
+    def test_orjson_renders_integer_keys(self):
+        data = {"borrowings": {0: ["A valid integer is required."]}}
+        self.assertEqual(OrjsonRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parsers_reject_malformed_bodies(self):
+        with self.assertRaises(ParseError):
+            OrjsonParser().parse(BytesIO(b'{"book": '))
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b"\xc1"))
+
+
+class ContentNegotiationTests(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        self.book = Book.objects.create(
+            title="Book", author="Author", cover="Hard", inventory=5, daily_fee="1.50"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_book_list_as_msgpack(self):
+        json_response = self.client.get(BOOK_URL)
+        response = self.client.get(BOOK_URL, HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), json_response.json())
+        self.assertEqual(json_response["Content-Type"], "application/json")
+        self.assertEqual(json_response.json()["results"][0]["daily_fee"], "1.50")
+
+    def test_borrow_with_msgpack_body(self):
+        expected_return_date = str(date.today() + timedelta(days=7))
+        body = msgpack.packb(
+            {"book": self.book.id, "expected_return_date": expected_return_date}
+        )
+        response = self.client.post(
+            BORROWING_URL,
+            body,
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            msgpack.unpackb(response.content)["expected_return_date"],
+            expected_return_date,
+        )
+
+    def test_malformed_json_body(self):
+        response = self.client.post(
+            BORROWING_URL, b'{"book": ', content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_item_level_list_errors(self):
+        response = self.client.post(
+            BULK_RETURN_URL, {"borrowings": ["x", 1]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("0", response.json()["borrowings"])
+
+    def test_benchmark_renderers(self):
+        out = StringIO()
+        call_command("benchmark_renderers", rows=10, repeat=1, stdout=out)
+        self.assertIn("books (1 rows): json", out.getvalue())
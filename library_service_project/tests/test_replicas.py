@@ -0,0 +1,106 @@
+import os
+import tempfile
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowing.models import Borrowing
+from library_service_project.replicas import get_pin_cache
+
+REPLICA = "replica_stand_in"
+BOOK_LIST_URL = reverse("books:book-list")
+BORROWING_LIST_URL = reverse("borrowing:borrowing-list")
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(APITestCase):
+    """
+    The test database is the primary and a second, separately migrated
+    SQLite database stands in for a replica, so every response shows which
+    one it was read from.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # Added here rather than as a class attribute: the test runner would
+        # look for the alias before it exists.
+        cls.databases = {"default", REPLICA}
+        cls.replica_dir = tempfile.TemporaryDirectory()
+        connections.settings[REPLICA] = connections.configure_settings(
+            {
+                "default": connections.settings["default"],
+                REPLICA: {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": os.path.join(cls.replica_dir.name, "replica.sqlite3"),
+                },
+            }
+        )[REPLICA]
+        call_command("migrate", database=REPLICA, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        cls.replica_dir.cleanup()
+
+    def setUp(self):
+        get_pin_cache().clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        self.book = Book.objects.create(
+            title="Primary", author="Author", cover="Hard", inventory=5, daily_fee=1
+        )
+        self.replica_book = Book.objects.using(REPLICA).create(
+            title="Replica", author="Author", cover="Soft", inventory=5, daily_fee=1
+        )
+
+    def titles(self, response):
+        return [book["title"] for book in response.data["results"]]
+
+    def test_lists_and_details_read_from_replica(self):
+        self.assertEqual(self.titles(self.client.get(BOOK_LIST_URL)), ["Replica"])
+        response = self.client.get(
+            reverse("books:book-detail", args=[self.replica_book.id])
+        )
+        self.assertEqual(response.data["title"], "Replica")
+
+    def test_writes_go_to_primary_and_pin_their_user(self):
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                BORROWING_LIST_URL,
+                {
+                    "book": self.book.id,
+                    "expected_return_date": date.today() + timedelta(days=7),
+                },
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Borrowing.objects.filter(user=self.user).exists())
+        self.assertFalse(Borrowing.objects.using(REPLICA).exists())
+
+        # Reads after the write come from the primary, for this user and,
+        # as the inventory changed, for the shared catalogue.
+        response = self.client.get(BORROWING_LIST_URL)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.titles(self.client.get(BOOK_LIST_URL)), ["Primary"])
+
+        get_pin_cache().clear()
+        self.client.force_authenticate(self.user)
+        response = self.client.get(BORROWING_LIST_URL)
+        self.assertEqual(response.data["results"], [])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_reads_from_primary(self):
+        self.assertEqual(self.titles(self.client.get(BOOK_LIST_URL)), ["Primary"])
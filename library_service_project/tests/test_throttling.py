@@ -0,0 +1,146 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from books.models import Book
+from library_service_project.throttling import (
+    CacheRateThrottle,
+    get_throttle_cache,
+)
+
+RATES = {
+    "login": "2/min",
+    "register": "2/min",
+    "borrow": "2/min",
+    "catalogue": "2/min",
+}
+
+
+class FixedRateThrottle(CacheRateThrottle):
+    scope = "test"
+    rate = "10/min"
+
+
+class CacheRateThrottleTests(TestCase):
+    def setUp(self):
+        get_throttle_cache().clear()
+
+    def check(self, now):
+        throttle = FixedRateThrottle()
+        throttle.timer = lambda: now
+        return throttle, throttle.allow_key("throttle:test:client")
+
+    def test_limit_within_a_window(self):
+        for second in range(10):
+            self.assertTrue(self.check(600 + second)[1])
+
+        throttle, allowed = self.check(630)
+        self.assertFalse(allowed)
+        # Until the next window, then until 9 of its 10 slots are free.
+        self.assertAlmostEqual(throttle.wait(), 30 + 6)
+        # Refused requests are not counted.
+        self.assertEqual(throttle.count, 10)
+
+    def test_previous_window_weight(self):
+        for second in range(10):
+            self.check(600 + second)
+
+        # A quarter into the next window, 7.5 of the 10 requests still count.
+        for _ in range(2):
+            self.assertTrue(self.check(675)[1])
+        throttle, allowed = self.check(675)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 3)
+        self.assertTrue(self.check(679)[1])
+
+
+@override_settings(
+    REST_FRAMEWORK={**api_settings.user_settings, "DEFAULT_THROTTLE_RATES": RATES}
+)
+class ThrottledEndpointTests(APITestCase):
+    def setUp(self):
+        get_throttle_cache().clear()
+        user_model = get_user_model()
+        self.user = user_model.objects.create_user(
+            email="user@user.com", password="user1234pass"
+        )
+        self.other_user = user_model.objects.create_user(
+            email="other@user.com", password="user1234pass"
+        )
+        self.book = Book.objects.create(
+            title="Book", author="Author", cover="Hard", inventory=10, daily_fee=1
+        )
+
+    def assertThrottled(self, response):
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(response["Retry-After"]), 0)
+
+    def test_login_per_client_address(self):
+        url = reverse("user:token_obtain_pair")
+        payload = {"email": "user@user.com", "password": "user1234pass"}
+        for _ in range(2):
+            response = self.client.post(url, payload)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertThrottled(self.client.post(url, payload))
+        response = self.client.post(url, payload, REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_register(self):
+        url = reverse("user:create")
+        for number in range(2):
+            response = self.client.post(
+                url, {"email": f"new{number}@user.com", "password": "new12345pass"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertThrottled(
+            self.client.post(
+                url, {"email": "new2@user.com", "password": "new12345pass"}
+            )
+        )
+
+    def test_borrowing_writes_per_user(self):
+        url = reverse("borrowing:borrowing-list")
+        payload = {
+            "book": self.book.id,
+            "expected_return_date": date.today() + timedelta(days=7),
+        }
+        self.client.force_authenticate(self.user)
+        for _ in range(2):
+            response = self.client.post(url, payload)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertThrottled(self.client.post(url, payload))
+        for _ in range(3):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(self.other_user)
+        response = self.client.post(url, payload)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_anonymous_catalogue_reads(self):
+        url = reverse("books:book-list")
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.assertThrottled(self.client.get(url))
+        self.assertThrottled(
+            self.client.get(reverse("books:book-detail", args=[self.book.id]))
+        )
+        headers = {"Authorization": f"Authorize {AccessToken.for_user(self.user)}"}
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_async_catalogue_reads(self):
+        url = reverse("books-async:book-list")
+        for _ in range(2):
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertThrottled(await self.async_client.get(url))
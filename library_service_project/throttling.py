@@ -0,0 +1,132 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def get_throttle_cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+class CacheRateThrottle(SimpleRateThrottle):
+    """
+    Limit a scope to `num_requests` per `duration` with a sliding window kept
+    as two fixed-window counters: the current window's count plus the
+    previous window's, weighted by how much of it still overlaps the last
+    `duration` seconds.
+
+    Unlike SimpleRateThrottle's list of timestamps, a check is an atomic
+    incr() and a get() of two integers whatever the rate, so concurrent
+    workers sharing the cache can't both take the last request. Refused
+    requests are given back and don't count.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    timer = staticmethod(time.time)
+
+    @property
+    def cache(self):
+        return get_throttle_cache()
+
+    def get_rate(self):
+        # Read the rates on every instantiation rather than once at import,
+        # so they follow override_settings().
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for {self.scope!r} scope"
+            )
+
+    def get_ident_key(self, request):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        return self.allow_key(self.key)
+
+    def allow_key(self, key):
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now, self.duration)
+        current = f"{key}:{window:.0f}"
+        cache = self.cache
+        # The previous window is still read during the next one.
+        timeout = self.duration * 2
+        try:
+            self.count = cache.incr(current)
+        except ValueError:
+            if cache.add(current, 1, timeout):
+                self.count = 1
+            else:
+                self.count = cache.incr(current)
+        self.previous = cache.get(f"{key}:{window - 1:.0f}", 0)
+
+        overlap = 1 - self.elapsed / self.duration
+        if self.previous * overlap + self.count <= self.num_requests:
+            return True
+        try:
+            cache.decr(current)
+        except ValueError:
+            pass
+        self.count -= 1
+        return False
+
+    def wait(self):
+        """Seconds until the window has room for one more request."""
+        if self.count >= self.num_requests:
+            # Wait for the next window, then for the weight of this one,
+            # which becomes the previous, to drop low enough.
+            room = (self.num_requests - 1) / max(self.count, 1)
+            return self.duration - self.elapsed + self.duration * (1 - room)
+        room = (self.num_requests - self.count - 1) / self.previous
+        return max(self.duration * (1 - room) - self.elapsed, 0)
+
+
+class LoginRateThrottle(CacheRateThrottle):
+    """Token requests per client address; every one checks a password hash."""
+
+    scope = "login"
+
+    def get_cache_key(self, request, view):
+        return self.get_ident_key(request)
+
+
+class RegisterRateThrottle(CacheRateThrottle):
+    """Registrations per client address."""
+
+    scope = "register"
+
+    def get_cache_key(self, request, view):
+        return self.get_ident_key(request)
+
+
+class BorrowRateThrottle(CacheRateThrottle):
+    """Borrowing writes per user."""
+
+    scope = "borrow"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return self.cache_format % {"scope": self.scope, "ident": request.user.pk}
+        return self.get_ident_key(request)
+
+
+class CatalogueRateThrottle(CacheRateThrottle):
+    """Anonymous catalogue reads per client address."""
+
+    scope = "catalogue"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.get_ident_key(request)
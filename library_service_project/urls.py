@@ -23,11 +23,27 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from library_service_project.views import (
+    DatabaseStatsView,
+    healthz,
+    metrics,
+    readyz,
+)
+
 urlpatterns = [
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
+    path("metrics", metrics, name="metrics"),
     path("admin/", admin.site.urls),
     path("api/books/", include("books.urls", namespace="books")),
     path("api/user/", include("user.urls", namespace="user")),
     path("api/borrowing/", include("borrowing.urls", namespace="borrowing")),
+    path("api/async/books/", include("books.async_urls", namespace="books-async")),
+    path(
+        "api/async/borrowing/",
+        include("borrowing.async_urls", namespace="borrowing-async"),
+    ),
+    path("api/db-stats/", DatabaseStatsView.as_view(), name="db-stats"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/schema/swagger-ui/",
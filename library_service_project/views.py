@@ -0,0 +1,127 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
+from drf_spectacular.utils import extend_schema
+from prometheus_client import CONTENT_TYPE_LATEST
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from library_service_project.metrics import generate_metrics
+
+logger = logging.getLogger(__name__)
+
+# Databases whose migrations were all applied; that can't change while the
+# process runs, so readiness stops loading the migration graph once it's true.
+_migrated_databases = set()
+
+
+def ping_database(alias="default"):
+    """Run a trivial query and return its round-trip time in milliseconds."""
+    started = time.perf_counter()
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def migrations_applied(alias="default"):
+    if alias not in _migrated_databases:
+        executor = MigrationExecutor(connections[alias])
+        if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+            return False
+        _migrated_databases.add(alias)
+    return True
+
+
+def database_unavailable(check):
+    # The probes need no auth and driver errors name hosts, databases and
+    # users, so the details only go to the log.
+    logger.exception("%s check failed to reach the database", check)
+    return JsonResponse(
+        {"status": "unavailable", "database": "unavailable"}, status=503
+    )
+
+
+@never_cache
+@require_safe
+def healthz(request):
+    """Liveness: the process answers and the database does a round trip."""
+    try:
+        latency = ping_database()
+    except DatabaseError:
+        return database_unavailable("Liveness")
+    return JsonResponse({"status": "ok", "database": {"latency_ms": latency}})
+
+
+@never_cache
+@require_safe
+def readyz(request):
+    """Readiness: the database answers and every migration is applied."""
+    try:
+        latency = ping_database()
+        migrated = migrations_applied()
+    except DatabaseError:
+        return database_unavailable("Readiness")
+    body = {
+        "status": "ok" if migrated else "migrating",
+        "database": {"latency_ms": latency, "migrations_applied": migrated},
+    }
+    return JsonResponse(body, status=200 if migrated else 503)
+
+
+@never_cache
+@require_safe
+def metrics(request):
+    """Request and SQL metrics in the Prometheus text format."""
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = "Bearer"
+        return response
+    return HttpResponse(generate_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
+def get_database_stats():
+    """Connection reuse settings and pool counters of this worker process."""
+    stats = {}
+    for connection in connections.all(initialized_only=True):
+        pool = getattr(connection, "pool", None)
+        pool_stats = None
+        if pool is not None:
+            pool_stats = pool.get_stats()
+            requests = pool_stats.get("requests_num", 0)
+            pool_stats["requests_wait_avg_ms"] = (
+                round(pool_stats.get("requests_wait_ms", 0) / requests, 3)
+                if requests
+                else 0
+            )
+        stats[connection.alias] = {
+            "vendor": connection.vendor,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "conn_health_checks": connection.settings_dict["CONN_HEALTH_CHECKS"],
+            "pool": pool_stats,
+        }
+    return stats
+
+
+class DatabaseStatsView(APIView):
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        responses={200: dict},
+        description=(
+            "Connection reuse settings and psycopg pool counters "
+            "(size, waiting requests, wait time) of the serving worker"
+        ),
+    )
+    def get(self, request):
+        return Response(get_database_stats())
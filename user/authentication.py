@@ -0,0 +1,111 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+CACHED_USER_FIELDS = ("id", "email", "is_staff", "is_superuser", "is_active")
+
+
+def get_user_cache():
+    return caches[settings.USER_CACHE_ALIAS]
+
+
+def user_cache_key(user_id):
+    return f"user:auth:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    get_user_cache().delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the token's user id through a short-lived
+    cache of user rows, so authenticated requests don't query the users table.
+    The cached row is dropped whenever the user is saved or deleted.
+
+    The user is a model instance with only CACHED_USER_FIELDS loaded; other
+    fields are fetched on access and save() only writes the loaded fields.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Revocation compares the password hash, which isn't cached.
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user_model = get_user_model()
+        cache = get_user_cache()
+        key = user_cache_key(user_id)
+        row = cache.get(key)
+        if row is None:
+            row = (
+                user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values(*CACHED_USER_FIELDS)
+                .first()
+            )
+            if row is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(key, row, settings.USER_CACHE_TIMEOUT)
+        return self.user_from_row(row)
+
+    async def aauthenticate(self, request):
+        """Async counterpart of authenticate() for the async views."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user_model = get_user_model()
+        cache = get_user_cache()
+        key = user_cache_key(user_id)
+        row = await cache.aget(key)
+        if row is None:
+            row = (
+                await user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values(*CACHED_USER_FIELDS)
+                .afirst()
+            )
+            if row is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            await cache.aset(key, row, settings.USER_CACHE_TIMEOUT)
+        return self.user_from_row(row)
+
+    def user_from_row(self, row):
+        user_model = get_user_model()
+        # from_db() expects the values in the model's field order.
+        field_names = [
+            field.attname
+            for field in user_model._meta.concrete_fields
+            if field.attname in row
+        ]
+        user = user_model.from_db(
+            router.db_for_read(user_model),
+            field_names,
+            [row[name] for name in field_names],
+        )
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,69 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from user.authentication import CachedJWTAuthentication, invalidate_cached_user
+from user.views import ManageUserView
+
+BENCHMARK_EMAIL = "benchmark-auth@example.com"
+
+
+class Command(BaseCommand):
+    """Django command to compare queries and latency of JWT authentication"""
+
+    help = (
+        "Call the `me` endpoint with a real access token using the database "
+        "backed JWTAuthentication and the cached CachedJWTAuthentication, "
+        "against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_config = setup_databases(
+            verbosity=0, interactive=False, aliases={"default"}
+        )
+        user = get_user_model().objects.create_user(email=BENCHMARK_EMAIL)
+        try:
+            header = f"Authorize {AccessToken.for_user(user)}"
+            for authentication_class in (JWTAuthentication, CachedJWTAuthentication):
+                self.run(authentication_class, header, options["requests"])
+        finally:
+            # The user cache isn't part of the test database.
+            invalidate_cached_user(user.pk)
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def run(self, authentication_class, header, requests):
+        view = ManageUserView.as_view(authentication_classes=(authentication_class,))
+        factory = RequestFactory()
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(requests):
+                request = factory.get("/api/user/me/", HTTP_AUTHORIZATION=header)
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                timings.append((time.perf_counter() - started) * 1000)
+
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(
+            f"{authentication_class.__name__}: "
+            f"{len(queries) / requests:.2f} queries/request, "
+            f"p50={percentiles[49]:.3f}ms p99={percentiles[98]:.3f}ms"
+        )
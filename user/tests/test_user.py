@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from user.authentication import get_user_cache
+
 CREATE_USER_URL = reverse("user:create")
 TOKEN_URL = reverse("user:token_obtain_pair")
 ME_URL = reverse("user:manage")
@@ -96,3 +99,55 @@ class UserApiTests(APITestCase):
         user.refresh_from_db()
         self.assertTrue(user.check_password(payload["password"]))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        get_user_cache().clear()
+        self.user = create_user(
+            email="user@user.com", password="user1234pass", first_name="Name"
+        )
+        response = self.client.post(
+            TOKEN_URL, {"email": "user@user.com", "password": "user1234pass"}
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Authorize {response.data['access']}"
+        )
+
+    def test_cached_user_skips_database(self):
+        self.client.get(ME_URL)
+        with self.assertNumQueries(0):
+            response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], self.user.email)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(ME_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_update_through_cached_user_keeps_other_fields(self):
+        self.client.get(ME_URL)
+        response = self.client.patch(ME_URL, {"email": "new@user.com"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, "new@user.com")
+        self.assertEqual(self.user.first_name, "Name")
+        self.assertTrue(self.user.check_password("user1234pass"))
+
+        response = self.client.get(ME_URL)
+        self.assertEqual(response.data["email"], "new@user.com")
+
+    def test_schema_documents_jwt_auth(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        self.assertIn("jwtAuth", schema["components"]["securitySchemes"])
+        self.assertIn(
+            {"jwtAuth": []}, schema["paths"]["/api/user/me/"]["get"]["security"]
+        )
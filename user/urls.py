@@ -5,11 +5,16 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+from library_service_project.throttling import LoginRateThrottle
 from user.views import CreateUserView, ManageUserView
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="create"),
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path(
+        "token/",
+        TokenObtainPairView.as_view(throttle_classes=(LoginRateThrottle,)),
+        name="token_obtain_pair",
+    ),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
     path("me/", ManageUserView.as_view(), name="manage"),
@@ -1,8 +1,8 @@
 from drf_spectacular.utils import extend_schema_view, extend_schema
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from library_service_project.throttling import RegisterRateThrottle
 from user.serializers import UserSerializer
 
 
@@ -14,6 +14,7 @@ from user.serializers import UserSerializer
 )
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
+    throttle_classes = (RegisterRateThrottle,)
 
 
 @extend_schema_view(
@@ -32,7 +33,6 @@ class CreateUserView(generics.CreateAPIView):
 )
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):